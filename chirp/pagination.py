@@ -1,12 +1,34 @@
-from rest_framework.pagination import PageNumberPagination
+from functools import partial
+
+from django.core.paginator import Paginator
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 
+class KnownCountPaginator(Paginator):
+    """Paginator that is handed its row count instead of running COUNT(*)"""
+
+    def __init__(self, object_list, per_page, *args, count=None, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        if count is not None:
+            # Primes the cached_property, so num_pages and page() never query for it
+            self.__dict__['count'] = count
+
+
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        """
+        Pass `count` when the caller has already counted `queryset`, to save
+        the paginator's own COUNT(*).
+        """
+        if count is not None:
+            self.django_paginator_class = partial(KnownCountPaginator, count=count)
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
         return Response({
             'count': self.page.paginator.count,
@@ -14,3 +36,11 @@ class StandardResultsSetPagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data
         })
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """Keyset pagination over `created_at`, newest first"""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
@@ -0,0 +1,25 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson. Types orjson does not know natively
+    (Decimal, lazy translation strings, ...) fall back to DRF's encoder.
+    """
+
+    _fallback = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # orjson can only indent by two spaces, so pretty-printed output
+        # (`; indent=N` in Accept, or the browsable API) keeps DRF's encoder
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(
+            data,
+            default=self._fallback,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
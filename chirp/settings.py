@@ -83,6 +83,8 @@ RABBITMQ_PASSWORD = os.getenv("RABBITMQ_PASSWORD", "")
 RABBITMQ_HOST = os.getenv("RABBITMQ_HOST", "localhost")
 RABBITMQ_PORT = os.getenv("RABBITMQ_PORT", "5672")
 RABBITMQ_VHOST = os.getenv("RABBITMQ_VHOST", "/")
+# Idle publisher connections kept open per process (see event_bus.publisher)
+RABBITMQ_POOL_SIZE = int(os.getenv("RABBITMQ_POOL_SIZE", "4"))
 
 RABBITMQ_USER_ENCODED = quote(RABBITMQ_USER, safe="")
 RABBITMQ_PASSWORD_ENCODED = quote(RABBITMQ_PASSWORD, safe="")
@@ -117,6 +119,10 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "chirp.verisafe_authentication.VerisafeAuthentication",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "chirp.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_PAGINATION_CLASS": "chirp.pagination.StandardResultsSetPagination",
     "PAGE_SIZE": 50,
 }
@@ -205,6 +211,13 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", "chirp_password"),
         "HOST": os.getenv("DB_HOST", "localhost"),
         "PORT": os.getenv("DB_PORT", "5432"),
+        # Reuse connections across requests instead of reconnecting each time
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        "TEST": {
+            # Set DB_TEST_MIGRATE=False to build the test schema straight from models
+            "MIGRATE": os.getenv("DB_TEST_MIGRATE", "True").lower() == "true",
+        },
     }
 }
 
@@ -312,7 +325,13 @@ STORAGES = {
 
 # File upload settings for large images
 DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
-FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
+# Uploads above this spill to a temp file in chunks instead of being held in
+# memory; S3Storage then streams them to the bucket as a multipart upload
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(2.5 * 1024 * 1024)  # 2.5MB
+FILE_UPLOAD_HANDLERS = [
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 1000
 
 # HTTPS Configuration
@@ -1,6 +1,7 @@
 from django.test import TestCase
 
 from .celery import debug_task
+from .renderers import ORJSONRenderer
 
 
 class TestCelery(TestCase):
@@ -17,3 +18,23 @@ class TestCelery(TestCase):
         result = debug_task()
         self.assertIsNone(result)
 
+
+class ORJSONRendererTest(TestCase):
+    def test_compact_by_default(self):
+        """Tests output is compact when no indent is requested"""
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json", {})
+        self.assertEqual(rendered, b'{"a":1}')
+
+    def test_indent_from_accept_header(self):
+        """Tests `Accept: application/json; indent=4` still pretty-prints"""
+        rendered = ORJSONRenderer().render(
+            {"a": 1}, "application/json; indent=4", {}
+        )
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+    def test_indent_from_renderer_context(self):
+        """Tests the indent the browsable API passes in the renderer context is honoured"""
+        rendered = ORJSONRenderer().render(
+            {"a": 1}, "application/json", {"indent": 2}
+        )
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
@@ -18,6 +18,8 @@ class CommunityAdmin(admin.ModelAdmin):
         "created_at",
         "updated_at",
     )
+    # creator is nullable, so the admin's automatic select_related() skips it
+    list_select_related = ("creator",)
 
 
 @admin.register(CommunityMembership)
@@ -31,6 +33,8 @@ class CommunityPostAdmin(admin.ModelAdmin):
         "banned_by",
         "joined_at",
     )
+    # The community column renders Community.__str__, which reads its creator
+    list_select_related = ("community__creator", "user", "banned_by")
 
 # @admin.register(CommunityInvite)
 # class CommunityInviteAdmin(admin.ModelAdmin):
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Count, Q
 from django.utils import timezone
 
 from users.models import User
@@ -59,6 +60,23 @@ class Community(models.Model):
         """
         return f"{self.name} created by ${self.creator}"
 
+    def refresh_membership_counts(self):
+        """
+        Recompute the member, moderator and banned-user counters from the community's memberships.
+
+        All three counts come from a single aggregate query, and only those three columns are saved.
+        """
+        counts = self.community_memberships.aggregate(
+            member_count=Count("id", filter=Q(banned=False)),
+            moderator_count=Count(
+                "id", filter=Q(banned=False, role__in=["moderator", "super-mod"])
+            ),
+            banned_users_count=Count("id", filter=Q(banned=True)),
+        )
+        for field, value in counts.items():
+            setattr(self, field, value)
+        self.save(update_fields=list(counts))
+
 
 class CommunityMembership(models.Model):
     ROLE_CHOICES = [
@@ -193,7 +211,7 @@ class InviteLink(models.Model):
         self.used_by = user_id
         self.used_by_name = user_name
         self.used_at = timezone.now()
-        self.save()
+        self.save(update_fields=["is_used", "used_by", "used_by_name", "used_at"])
 
     def save(self, *args, **kwargs):
         """
@@ -1,9 +1,32 @@
 from rest_framework.permissions import BasePermission
 
-from users.models import User
 from .models import CommunityMembership
 
 
+def _active_role(request, community_id):
+    """
+    Return the requesting user's role in the community, or None if they are not
+    an active (non-banned) member.
+
+    The role is looked up once per community and remembered on the request, so
+    stacked community permissions share a single query.
+    """
+    user_id = getattr(request, "user_id", None)
+    if not user_id:
+        return None
+
+    roles = request.__dict__.setdefault("_community_roles", {})
+    if community_id not in roles:
+        roles[community_id] = (
+            CommunityMembership.objects.filter(
+                community_id=community_id, user_id=user_id, banned=False
+            )
+            .values_list("role", flat=True)
+            .first()
+        )
+    return roles[community_id]
+
+
 class IsCommunityMember(BasePermission):
     """
     Allows access only to users who are active members of the community.
@@ -13,24 +36,12 @@ class IsCommunityMember(BasePermission):
         """
         Allow access only to active, non-banned members of the community identified in the view kwargs.
         
-        Checks that the request contains a `user_id`, that the corresponding User exists, and that a CommunityMembership exists for that user and the community identified by `view.kwargs['community_id']` with `banned=False`. Returns False if `user_id` is missing or the User does not exist.
+        Checks that the request contains a `user_id` and that a CommunityMembership exists for that user and the community identified by `view.kwargs['community_id']` with `banned=False`. The membership is matched on its user_id column, so an unknown user simply has no row and no separate User lookup is needed. Returns False if `user_id` is missing.
         
         Returns:
             True if the requesting user is an active, non-banned member of the community identified by `view.kwargs['community_id']`, False otherwise.
         """
-        user_id = getattr(request, "user_id", None)
-        if not user_id:
-            return False
-
-        try:
-            user = User.objects.get(user_id=user_id)
-        except User.DoesNotExist:
-            return False
-
-        community_id = view.kwargs.get("community_id")
-        return CommunityMembership.objects.filter(
-            community_id=community_id, user=user, banned=False
-        ).exists()
+        return _active_role(request, view.kwargs.get("community_id")) is not None
 
 
 class IsCommunityModerator(BasePermission):
@@ -49,22 +60,7 @@ class IsCommunityModerator(BasePermission):
         Returns:
             True if the requesting user is a non-banned moderator or super-mod of the specified community, False otherwise.
         """
-        user_id = getattr(request, "user_id", None)
-        if not user_id:
-            return False
-
-        try:
-            user = User.objects.get(user_id=user_id)
-        except User.DoesNotExist:
-            return False
-
-        community_id = view.kwargs.get("community_id")
-        return CommunityMembership.objects.filter(
-            community_id=community_id,
-            user=user,
-            role__in=["moderator", "super-mod"],
-            banned=False,
-        ).exists()
+        return _active_role(request, view.kwargs.get("community_id")) in ("moderator", "super-mod")
 
 
 class IsCommunitySuperMod(BasePermission):
@@ -83,19 +79,4 @@ class IsCommunitySuperMod(BasePermission):
         Returns:
             True if the requesting user is an active (not banned) super-mod of the specified community, False otherwise.
         """
-        user_id = getattr(request, "user_id", None)
-        if not user_id:
-            return False
-
-        try:
-            user = User.objects.get(user_id=user_id)
-        except User.DoesNotExist:
-            return False
-
-        community_id = view.kwargs.get("community_id")
-        return CommunityMembership.objects.filter(
-            community_id=community_id,
-            user=user,
-            role__in=["super-mod"],
-            banned=False,
-        ).exists()
+        return _active_role(request, view.kwargs.get("community_id")) == "super-mod"
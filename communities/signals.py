@@ -34,26 +34,7 @@ def update_member_count_on_create(sender, instance, created, **kwargs):
         instance (CommunityMembership): The membership that triggered the signal; its associated community is used to recompute counts.
         created (bool): Whether the membership was newly created.
     """
-    community = instance.community
-
-    # Update member count
-    community.member_count = community.community_memberships.filter(
-        banned=False
-    ).count()
-
-    # Update moderator count
-    community.moderator_count = community.community_memberships.filter(
-        role__in=["moderator", "super-mod"], banned=False
-    ).count()
-
-    # Update banned users count
-    community.banned_users_count = community.community_memberships.filter(
-        banned=True
-    ).count()
-
-    community.save(
-        update_fields=["member_count", "moderator_count", "banned_users_count"]
-    )
+    instance.community.refresh_membership_counts()
 
 
 @receiver(post_delete, sender=CommunityMembership)
@@ -70,18 +51,4 @@ def update_member_count_on_delete(sender, instance, **kwargs):
     Parameters:
         instance (CommunityMembership): The membership instance that was deleted.
     """
-    community = instance.community
-
-    community.member_count = community.community_memberships.filter(
-        banned=False
-    ).count()
-    community.moderator_count = community.community_memberships.filter(
-        role__in=["moderator", "super-mod"], banned=False
-    ).count()
-    community.banned_users_count = community.community_memberships.filter(
-        banned=True
-    ).count()
-
-    community.save(
-        update_fields=["member_count", "moderator_count", "banned_users_count"]
-    )
+    instance.community.refresh_membership_counts()
@@ -0,0 +1,49 @@
+from django.test import TestCase
+
+from users.models import User
+from .models import Community, CommunityMembership
+from .views import BAN_FIELDS
+
+
+class CommunityMembershipCountsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner = User.objects.create(name="Owner", username="owner")
+        cls.member = User.objects.create(name="Member", username="member")
+        cls.other = User.objects.create(name="Other", username="other")
+        cls.community = Community.objects.create(
+            name="General", visibility="public", private=False, creator=cls.owner
+        )
+
+    def assertCounts(self, member_count, moderator_count, banned_users_count):
+        self.community.refresh_from_db()
+        self.assertEqual(
+            (
+                self.community.member_count,
+                self.community.moderator_count,
+                self.community.banned_users_count,
+            ),
+            (member_count, moderator_count, banned_users_count),
+        )
+
+    def test_counts_follow_join_ban_and_leave(self):
+        """Membership writes keep the community's three counters in step."""
+        # The creator joins as a super-mod when the community is created
+        self.assertCounts(1, 1, 0)
+
+        membership = CommunityMembership.objects.create(
+            community=self.community, user=self.member, role="member"
+        )
+        CommunityMembership.objects.create(
+            community=self.community, user=self.other, role="moderator"
+        )
+        self.assertCounts(3, 2, 0)
+
+        membership.banned = True
+        membership.banned_by = self.owner
+        membership.banning_reason = "Spamming"
+        membership.save(update_fields=BAN_FIELDS)
+        self.assertCounts(2, 2, 1)
+
+        CommunityMembership.objects.get(community=self.community, user=self.other).delete()
+        self.assertCounts(1, 1, 1)
@@ -16,7 +16,7 @@ from event_bus.models.gossip_monger_notification_payload import (
     GOSSIP_MONGER_ROUTING_KEY,
     GossipMongerNotificationPayLoad,
 )
-from event_bus.publisher import publish
+from event_bus.publisher import publish_on_commit
 from interactions.models import Block
 from users.models import User
 from .models import Community, CommunityMembership
@@ -24,6 +24,7 @@ from .serializers import (
     CommunityMembershipSerializer,
     CommunitySerializer,
 )
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 
@@ -39,6 +40,7 @@ class CommunityCreateView(CreateAPIView):
     serializer_class = CommunitySerializer
     queryset = Community.objects.all()
 
+    @transaction.atomic
     def perform_create(self, serializer: CommunitySerializer):
         # Get the user id
         """
@@ -81,8 +83,8 @@ class CommunityCreateView(CreateAPIView):
             small_icon=None,
             url=f"academia://communities/{community.id}",
         )
-        publish(
-            GOSSIP_MONGER_EXCHANGE, GOSSIP_MONGER_ROUTING_KEY, notification.to_json()
+        publish_on_commit(
+            GOSSIP_MONGER_EXCHANGE, GOSSIP_MONGER_ROUTING_KEY, notification.to_bytes()
         )
 
 
@@ -310,6 +312,11 @@ class CommunityPostableView(ListAPIView):
             raise e
 
 
+# The only membership columns a ban or unban changes; saving just these keeps
+# the UPDATE narrow while post_save still refreshes the community's counts
+BAN_FIELDS = ["banned", "banned_by", "banning_reason", "banned_at"]
+
+
 class CommunityBanUserView(UpdateAPIView):
     """
     Ban or unban a user from a community based on the `action` query param:
@@ -332,6 +339,7 @@ class CommunityBanUserView(UpdateAPIView):
         community_id = self.kwargs.get("community_id")
         return CommunityMembership.objects.filter(community_id=community_id)
 
+    @transaction.atomic
     def perform_update(self, serializer: CommunityMembershipSerializer):
         """
         Ban or unban a community membership based on the request's `action` query parameter.
@@ -378,12 +386,11 @@ class CommunityBanUserView(UpdateAPIView):
             if membership.banned:
                 return membership  # Already banned
             reason = self.request.query_params.get("reason", "No reason provided")
-            serializer.save(
-                banned=True,
-                banned_by=current_user,
-                banning_reason=reason,
-                banned_at=timezone.now(),
-            )
+            membership.banned = True
+            membership.banned_by = current_user
+            membership.banning_reason = reason
+            membership.banned_at = timezone.now()
+            membership.save(update_fields=BAN_FIELDS)
             notification: GossipMongerNotificationPayLoad = (
                 GossipMongerNotificationPayLoad(
                     headings={
@@ -405,21 +412,20 @@ class CommunityBanUserView(UpdateAPIView):
                     url=f"academia://communities/{community.id}",
                 )
             )
-            publish(
+            publish_on_commit(
                 GOSSIP_MONGER_EXCHANGE,
                 GOSSIP_MONGER_ROUTING_KEY,
-                notification.to_json(),
+                notification.to_bytes(),
             )
 
         else:  # unban
             if not membership.banned:
                 return membership
-            serializer.save(
-                banned=False,
-                banned_by=None,
-                banning_reason=None,
-                banned_at=None,
-            )
+            membership.banned = False
+            membership.banned_by = None
+            membership.banning_reason = None
+            membership.banned_at = None
+            membership.save(update_fields=BAN_FIELDS)
             notification: GossipMongerNotificationPayLoad = (
                 GossipMongerNotificationPayLoad(
                     headings={
@@ -441,10 +447,10 @@ class CommunityBanUserView(UpdateAPIView):
                     url=None,
                 )
             )
-            publish(
+            publish_on_commit(
                 GOSSIP_MONGER_EXCHANGE,
                 GOSSIP_MONGER_ROUTING_KEY,
-                notification.to_json(),
+                notification.to_bytes(),
             )
 
 
@@ -455,6 +461,7 @@ class CommunityJoinView(CreateAPIView):
 
     serializer_class = CommunityMembershipSerializer
 
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         """
         Create or retrieve a community membership for the requesting user.
@@ -516,10 +523,10 @@ class CommunityJoinView(CreateAPIView):
             url=f"academia:///communities/{community.id}",
         )
 
-        publish(
+        publish_on_commit(
             GOSSIP_MONGER_EXCHANGE,
             GOSSIP_MONGER_ROUTING_KEY,
-            notification.to_json(),
+            notification.to_bytes(),
         )
 
         serializer = self.get_serializer(membership)
@@ -532,6 +539,7 @@ class CommunityJoinView(CreateAPIView):
 class CommunityLeaveView(DestroyAPIView):
     serializer_class = CommunityMembershipSerializer
 
+    @transaction.atomic
     def delete(self, request, *args, **kwargs):
         user_id = getattr(self.request, "user_id", None)
         if not user_id:
@@ -583,10 +591,10 @@ class CommunityLeaveView(DestroyAPIView):
             url=f"academia://communities/{community.id}",
         )
 
-        publish(
+        publish_on_commit(
             GOSSIP_MONGER_EXCHANGE,
             GOSSIP_MONGER_ROUTING_KEY,
-            notification.to_json(),
+            notification.to_bytes(),
         )
 
         return Response(
@@ -9,9 +9,6 @@ class ConversationAdmin(admin.ModelAdmin):
     search_fields = ['conversation_id', 'participants']
     readonly_fields = ['conversation_id', 'created_at', 'updated_at']
 
-    def get_queryset(self, request):
-        return super().get_queryset(request).prefetch_related('messages')
-
 
 @admin.register(ConversationMessage)
 class ConversationMessageAdmin(admin.ModelAdmin):
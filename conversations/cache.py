@@ -0,0 +1,18 @@
+from django.core.cache import cache
+
+CONVERSATION_LIST_CACHE_TIMEOUT = 300
+
+
+def conversation_list_cache_key(user_id):
+    return f"conv_list:{user_id}"
+
+
+def invalidate_conversation_lists(participants):
+    """
+    Drop the cached conversation list of every participant.
+
+    Every write that changes what ConversationListSerializer shows (a new or
+    edited message, read state, a new conversation) must call this, whether
+    it comes through the REST views or the websocket consumer.
+    """
+    cache.delete_many([conversation_list_cache_key(uid) for uid in participants])
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.4 on 2026-10-17 09:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("conversations", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="conversation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["participants"],
+                name="conv_participants_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.4 on 2026-10-17 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("conversations", "0003_conversation_conv_participants_gin"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="conversationmessage",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name="conversationmessage",
+            index=models.Index(
+                fields=["conversation", "-created_at"], name="msg_conv_created_desc"
+            ),
+        ),
+    ]
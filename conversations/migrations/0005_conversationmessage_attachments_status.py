@@ -0,0 +1,27 @@
+# Generated by Django 6.0.4 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("conversations", "0004_conversationmessage_created_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conversationmessage",
+            name="attachments_status",
+            field=models.CharField(
+                choices=[
+                    ("none", "None"),
+                    ("processing", "Processing"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="none",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -1,5 +1,8 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
+from dmessages.models import MessageAttachment
+
 
 class Conversation(models.Model):
     conversation_id = models.CharField(max_length=100, unique=True)
@@ -11,6 +14,10 @@ class Conversation(models.Model):
     class Meta:
         db_table = 'conversations_conversation'
         ordering = ['-last_message_at', '-created_at']
+        indexes = [
+            # Serves the participants__contains (jsonb @>) lookups
+            GinIndex(fields=['participants'], name='conv_participants_gin', opclasses=['jsonb_path_ops']),
+        ]
 
     def __str__(self):
         return f"Conversation {self.conversation_id}"
@@ -20,14 +27,20 @@ class ConversationMessage(models.Model):
     conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='messages')
     sender_id = models.CharField(max_length=100)
     content = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     is_read = models.BooleanField(default=False)
+    attachments_status = models.CharField(
+        max_length=10, choices=MessageAttachment.UPLOAD_STATUS_CHOICES, default='none'
+    )
 
     sender_ref = models.ForeignKey('users.User', on_delete=models.CASCADE, null=True, blank=True, related_name='conversation_messages')
 
     class Meta:
         db_table = 'conversations_conversationmessage'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['conversation', '-created_at'], name='msg_conv_created_desc'),
+        ]
 
     def __str__(self):
         return f"{self.sender_id}: {self.content}..."
@@ -1,15 +1,16 @@
 from rest_framework import serializers
 from .models import Conversation, ConversationMessage
-from dmessages.serializers import MessageAttachmentSerializer
+from dmessages.serializers import CachedFieldsMixin, MessageAttachmentSerializer
 
 
-class ConversationMessageSerializer(serializers.ModelSerializer):
+class ConversationMessageSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     attachments = serializers.SerializerMethodField()
 
     class Meta:
         model = ConversationMessage
-        fields = ['id', 'conversation', 'sender_id', 'content', 'created_at', 'is_read', 'attachments']
-        read_only_fields = ['id', 'created_at']
+        fields = ['id', 'conversation', 'sender_id', 'content', 'created_at', 'is_read', 'attachments',
+                  'attachments_status']
+        read_only_fields = ['id', 'created_at', 'attachments_status']
 
     def get_attachments(self, obj):
         """Get attachments with proper context for URL generation"""
@@ -17,7 +18,7 @@ class ConversationMessageSerializer(serializers.ModelSerializer):
         return MessageAttachmentSerializer(attachments, many=True, context=self.context).data
 
 
-class ConversationListSerializer(serializers.ModelSerializer):
+class ConversationListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing conversations (without messages)"""
     message_count = serializers.SerializerMethodField()
     last_message = serializers.SerializerMethodField()
@@ -30,11 +31,19 @@ class ConversationListSerializer(serializers.ModelSerializer):
 
     def get_message_count(self, obj):
         """Get total message count for this conversation"""
+        # ConversationListView annotates the count; other callers query for it
+        message_count = getattr(obj, 'message_count', None)
+        if message_count is not None:
+            return message_count
         return obj.messages.count()
 
     def get_last_message(self, obj):
         """Get only the last message preview (not full message)"""
-        last_message = obj.messages.last()
+        latest_messages = getattr(obj, 'latest_messages', None)
+        if latest_messages is not None:
+            last_message = latest_messages[0] if latest_messages else None
+        else:
+            last_message = obj.messages.last()
         if last_message:
             return {
                 'sender_id': last_message.sender_id,
@@ -46,13 +55,16 @@ class ConversationListSerializer(serializers.ModelSerializer):
 
     def get_unread_count(self, obj):
         """Get unread message count for the current user"""
+        unread_count = getattr(obj, 'unread_count', None)
+        if unread_count is not None:
+            return unread_count
         user_id = self.context.get('user_id')
         if user_id:
             return obj.messages.filter(is_read=False).exclude(sender_id=user_id).count()
         return 0
 
 
-class ConversationSerializer(serializers.ModelSerializer):
+class ConversationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Full conversation serializer with messages (for detailed view)"""
     messages = ConversationMessageSerializer(many=True, read_only=True)
     last_message = serializers.SerializerMethodField()
@@ -0,0 +1,102 @@
+from celery import Task, shared_task
+from celery.app.trace import logging
+from django.db import DatabaseError, transaction
+
+from conversations.models import ConversationMessage
+from dmessages.models import MessageAttachment
+from utils.uploads import discard_staged_uploads
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_FILE_FIELD = MessageAttachment._meta.get_field("file")
+
+
+def mark_attachments_failed(message_id: int) -> None:
+    """
+    Tells the client polling attachments_status that the attachments of
+    ConversationMessage message_id will never arrive.
+    """
+    try:
+        ConversationMessage._default_manager.filter(id=message_id).update(
+            attachments_status="failed"
+        )
+    except DatabaseError:
+        logger.exception(
+            f"Cannot mark attachments failed for ConversationMessage id={message_id}."
+        )
+
+
+class PersistConversationAttachmentsTask(Task):
+    """
+    Marks the message's attachments failed once the task has failed for
+    good, whatever the exception, rather than leaving it "processing".
+    """
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        message_id = kwargs.get("message_id", args[0] if args else None)
+        logger.error(
+            f"Giving up on attachments for ConversationMessage id={message_id}: {exc!r}"
+        )
+        mark_attachments_failed(message_id)
+
+
+def enqueue_persist_conversation_attachments(message_id: int, staged_files: list) -> None:
+    """
+    transaction.on_commit callback that queues persist_conversation_attachments;
+    if the broker is unreachable the message is marked failed instead.
+    """
+    try:
+        persist_conversation_attachments.delay(message_id, staged_files)
+    except Exception:
+        logger.exception(
+            f"Cannot queue attachments for ConversationMessage id={message_id}."
+        )
+        mark_attachments_failed(message_id)
+
+
+@shared_task(
+    bind=True,
+    base=PersistConversationAttachmentsTask,
+    autoretry_for=(DatabaseError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def persist_conversation_attachments(self, message_id: int, staged_files: list) -> None:
+    """
+    Records attachment files staged in storage against a conversation message.
+
+    The staged files are only deleted when the message no longer exists. On
+    any other failure they are kept for the retry. Once the task fails for
+    good, for whatever reason, the message's attachments_status is set to
+    "failed".
+
+    Args:
+        message_id: The primary key of the ConversationMessage.
+        staged_files: Descriptions returned by utils.uploads.stage_upload.
+    """
+    messages = ConversationMessage._default_manager.filter(id=message_id)
+    status = messages.values_list("attachments_status", flat=True).first()
+    if status is None:
+        logger.error(
+            f"Cannot persist attachments: ConversationMessage with id={message_id} not found."
+        )
+        discard_staged_uploads(staged_files, ATTACHMENT_FILE_FIELD)
+        return
+    if status == "ready":
+        # An earlier attempt committed; the broker redelivered it
+        return
+
+    attachment_type_for = MessageAttachment.attachment_type_for
+    with transaction.atomic():
+        # The files are already in storage, so each row just names its file
+        MessageAttachment._default_manager.bulk_create([
+            MessageAttachment(
+                conversation_message_id=message_id,
+                file=staged["stored_name"],
+                attachment_type=attachment_type_for(staged["content_type"]),
+                file_size=staged["size"],
+                original_filename=staged["name"],
+            )
+            for staged in staged_files
+        ])
+        messages.update(attachments_status="ready")
@@ -1,6 +1,17 @@
+import hashlib
+from functools import cached_property, partial
+
 from rest_framework import status, generics
 from rest_framework.response import Response
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Prefetch, Q
 from django.shortcuts import get_object_or_404
+from .cache import (
+    CONVERSATION_LIST_CACHE_TIMEOUT,
+    conversation_list_cache_key,
+    invalidate_conversation_lists,
+)
 from .models import Conversation, ConversationMessage
 from .serializers import (
     ConversationSerializer,
@@ -8,17 +19,39 @@ from .serializers import (
     ConversationCreateSerializer,
     ConversationMessageSerializer
 )
-from dmessages.models import MessageAttachment
+from dmessages.views import attachments_prefetch
+from utils.uploads import discard_staged_uploads, stage_uploads
 from rest_framework.views import APIView
+from chirp.pagination import CreatedAtCursorPagination
+from .tasks import ATTACHMENT_FILE_FIELD, enqueue_persist_conversation_attachments
+
+RECENT_MESSAGES_LIMIT = 50
+
+
+def participants_lock_key(participants):
+    """
+    Stable signed 64-bit key for pg_advisory_xact_lock, identical across
+    processes for the same sorted participants (unlike the salted hash()).
+    """
+    digest = hashlib.blake2b('\x1f'.join(participants).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
 
+class UserIdMixin:
+    """Resolve the `user_id` query parameter once per request"""
 
-class ConversationListView(APIView):
+    @cached_property
+    def query_user_id(self):
+        return self.request.GET.get('user_id')
+
+
+class ConversationListView(UserIdMixin, APIView):
     """List all conversations for a specific user"""
 
     def get(self, request):
         """Get all conversations for the specified user"""
         # Get user_id from query parameter
-        user_id = request.GET.get('user_id')
+        user_id = self.query_user_id
 
         if not user_id:
             return Response({
@@ -26,32 +59,52 @@ class ConversationListView(APIView):
                 'example': 'GET /conversations/?user_id=default_user_123'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        conversations = Conversation._default_manager.filter(
-            participants__contains=[user_id]
-        ).prefetch_related(
-            'messages'
-        ).order_by('-last_message_at', '-created_at')
-
-        serializer = ConversationListSerializer(
-            conversations,
-            many=True,
-            context={'request': request, 'user_id': user_id}
+        def build_listing():
+            # Counts come from one aggregate and only each conversation's newest
+            # message is fetched, instead of loading every message's content
+            conversations = list(Conversation._default_manager.filter(
+                participants__contains=[user_id]
+            ).annotate(
+                message_count=Count('messages'),
+                unread_count=Count(
+                    'messages',
+                    filter=Q(messages__is_read=False) & ~Q(messages__sender_id=user_id)
+                ),
+            ).prefetch_related(
+                Prefetch(
+                    'messages',
+                    queryset=ConversationMessage._default_manager.only(
+                        'id', 'conversation', 'sender_id', 'content', 'created_at', 'is_read'
+                    ).order_by('-created_at', '-id')[:1],
+                    to_attr='latest_messages'
+                )
+            ).order_by('-last_message_at', '-created_at'))
+
+            serializer = ConversationListSerializer(
+                conversations,
+                many=True,
+                context={'request': request, 'user_id': user_id}
+            )
+            return {'results': serializer.data, 'total_count': len(conversations)}
+
+        listing = cache.get_or_set(
+            conversation_list_cache_key(user_id), build_listing, CONVERSATION_LIST_CACHE_TIMEOUT
         )
 
         return Response({
             'user_id': user_id,
-            'results': serializer.data,
-            'total_count': conversations.count()
+            'results': listing['results'],
+            'total_count': listing['total_count']
         })
 
 
-class ConversationDetailView(APIView):
+class ConversationDetailView(UserIdMixin, APIView):
     """Get conversation details and messages"""
 
     def get(self, request, conversation_id):
         """Get conversation details and recent messages"""
         # Get user_id from query parameter
-        user_id = request.GET.get('user_id')
+        user_id = self.query_user_id
 
         if not user_id:
             return Response({
@@ -68,32 +121,37 @@ class ConversationDetailView(APIView):
         if user_id not in conversation.participants:
             return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        messages = ConversationMessage._default_manager.filter(
+        messages = list(ConversationMessage._default_manager.filter(
             conversation=conversation
         ).select_related('conversation').prefetch_related(
-            'attachments'
-        ).order_by('-created_at')[:50]
+            attachments_prefetch('conversation_message')
+        ).order_by('-created_at')[:RECENT_MESSAGES_LIMIT])
+
+        # A short page already holds every message, so only count when it is full
+        if len(messages) < RECENT_MESSAGES_LIMIT:
+            total_messages = len(messages)
+        else:
+            total_messages = ConversationMessage._default_manager.filter(conversation=conversation).count()
 
-        messages = list(reversed(messages))
+        messages.reverse()
 
-        conversation_serializer = ConversationSerializer(conversation, context={'request': request})
         message_serializer = ConversationMessageSerializer(messages, many=True, context={'request': request})
 
         return Response({
             'conversation_id': conversation.conversation_id,
             'participants': conversation.participants,
             'messages': message_serializer.data,
-            'total_messages': ConversationMessage._default_manager.filter(conversation=conversation).count()
+            'total_messages': total_messages
         })
 
 
-class ConversationCreateView(APIView):
+class ConversationCreateView(UserIdMixin, APIView):
     """Create a new conversation between two users or find existing one"""
 
     def post(self, request):
         """Create or find conversation between two users"""
         # Get user_id from query parameter
-        user_id = request.GET.get('user_id')
+        user_id = self.query_user_id
 
         if not user_id:
             return Response({
@@ -106,53 +164,77 @@ class ConversationCreateView(APIView):
         if isinstance(participants, str):
             participants = [participants]
 
-        if user_id not in participants:
-            participants.append(user_id)
+        if not isinstance(participants, list) or not all(
+            isinstance(pid, str) and pid for pid in participants
+        ):
+            return Response(
+                {'error': 'participants must be a list of user id strings'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Normalise in one pass (adding the requester and dropping duplicates) so
+        # the same set of users always maps to the same stored list
+        participants = sorted({*participants, user_id})
 
         if len(participants) < 2:
             return Response({'error': 'At least 2 participants required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        existing_conversation = Conversation._default_manager.filter(
-            participants__contains=participants
-        ).first()
-
-        if existing_conversation:
-            serializer = ConversationSerializer(existing_conversation, context={'request': request})
+        with transaction.atomic():
+            # A row lock cannot guard a row that does not exist yet, so concurrent
+            # creates for the same participants queue on an advisory lock instead
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(%s)", [participants_lock_key(participants)]
+                )
+            existing_conversation = Conversation._default_manager.filter(
+                participants__contains=participants
+            ).first()
+
+            if not existing_conversation:
+                # Create new conversation
+                conversation_data = {
+                    'participants': participants,
+                    'participant_names': [f"User {pid}" for pid in participants],
+                    'created_by': user_id
+                }
+
+                serializer = ConversationCreateSerializer(data=conversation_data)
+                if not serializer.is_valid():
+                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+                conversation = serializer.save()
+                transaction.on_commit(lambda: invalidate_conversation_lists(participants))
+
+        # ConversationCreateSerializer only renders participants, so one full
+        # serializer builds the response for both branches
+        is_new = existing_conversation is None
+        serialized = ConversationSerializer(
+            conversation if is_new else existing_conversation, context={'request': request}
+        ).data
+
+        if not is_new:
             return Response({
                 'message': 'Conversation found',
-                'conversation': serializer.data,
+                'conversation': serialized,
                 'is_new': False
             }, status=status.HTTP_200_OK)
 
-        # Create new conversation
-        conversation_data = {
-            'participants': participants,
-            'participant_names': [f"User {pid}" for pid in participants],
-            'created_by': user_id
-        }
-
-        serializer = ConversationCreateSerializer(data=conversation_data)
-        if serializer.is_valid():
-            conversation = serializer.save()
-
-            return Response({
-                'message': 'Conversation created successfully',
-                'conversation': ConversationSerializer(conversation, context={'request': request}).data,
-                'is_new': True
-            }, status=status.HTTP_201_CREATED)
-
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'message': 'Conversation created successfully',
+            'conversation': serialized,
+            'is_new': True
+        }, status=status.HTTP_201_CREATED)
 
 
-class ConversationMessagesView(generics.ListCreateAPIView):
+class ConversationMessagesView(UserIdMixin, generics.ListCreateAPIView):
     """
     Get messages for a specific conversation and create new messages
     """
     serializer_class = ConversationMessageSerializer
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         conversation_id = self.kwargs.get('conversation_id')
-        user_id = self.request.GET.get('user_id')
+        user_id = self.query_user_id
         if not user_id:
             return ConversationMessage._default_manager.none()
 
@@ -163,19 +245,18 @@ class ConversationMessagesView(generics.ListCreateAPIView):
             participants__contains=[user_id]
         )
 
-        return ConversationMessage._default_manager.filter(conversation=conversation)
+        return ConversationMessage._default_manager.filter(
+            conversation=conversation
+        ).select_related('conversation').prefetch_related(attachments_prefetch('conversation_message')).order_by('-created_at')
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        user_id = self.request.GET.get('user_id')
-        if not user_id:
-            user_id = "default_user_123"
-        context['user_id'] = user_id
+        context['user_id'] = self.query_user_id or "default_user_123"
         return context
 
     def create(self, request, *args, **kwargs):
         conversation_id = self.kwargs.get('conversation_id')
-        user_id = request.GET.get('user_id')
+        user_id = self.query_user_id
 
         if not user_id:
             return Response({
@@ -209,31 +290,31 @@ class ConversationMessagesView(generics.ListCreateAPIView):
 
         serializer = self.get_serializer(data=message_data)
         serializer.is_valid(raise_exception=True)
-        message = serializer.save()
-
-        # Handle file uploads
         files = request.FILES.getlist('attachments')
-        for file in files:
-            content_type = file.content_type.lower()
-            if "image" in content_type:
-                attachment_type = "image"
-            elif "video" in content_type:
-                attachment_type = "video"
-            elif "audio" in content_type:
-                attachment_type = "audio"
-            else:
-                attachment_type = "file"
-
-            MessageAttachment._default_manager.create(
-                conversation_message=message,
-                file=file,
-                attachment_type=attachment_type
+        # Files go to shared storage before the message exists, so a failed
+        # upload never leaves a message stuck in "processing"
+        staged_files = stage_uploads(files, ATTACHMENT_FILE_FIELD)
+        try:
+            message = serializer.save(attachments_status='processing' if files else 'none')
+        except Exception:
+            discard_staged_uploads(staged_files, ATTACHMENT_FILE_FIELD)
+            raise
+
+        # The Celery worker records the files once the message is committed,
+        # and the client polls attachments_status
+        if staged_files:
+            transaction.on_commit(
+                partial(enqueue_persist_conversation_attachments, message.id, staged_files)
             )
 
-        # Update conversation's last_message_at
-        conversation.last_message_at = message.created_at
-        conversation.save()
+        # Update conversation's last_message_at (update() skips auto_now, so bump updated_at too)
+        Conversation._default_manager.filter(pk=conversation.pk).update(
+            last_message_at=message.created_at,
+            updated_at=message.created_at
+        )
+        invalidate_conversation_lists(conversation.participants)
 
-        # Return response with attachments
         response_serializer = self.get_serializer(message)
+        if files:
+            return Response(response_serializer.data, status=status.HTTP_202_ACCEPTED)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from dmessages.tasks import backfill_attachment_metadata
+
+
+class Command(BaseCommand):
+    help = "Fill in file_size and original_filename on attachments saved without them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Attachments read per batch")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        batches = 0
+        after_id = 0
+        # Runs the task body in-process, one batch after another, until none are left
+        while (after_id := backfill_attachment_metadata(batch_size, after_id)) is not None:
+            batches += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Attachment batches processed: {batches}"))
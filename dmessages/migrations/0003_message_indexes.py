@@ -0,0 +1,25 @@
+# Generated by Django 6.0.4 on 2026-10-17 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dmessages", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["recipient_id", "-created_at"], name="msg_recip_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["sender_id", "-created_at"], name="msg_sender_created_idx"
+            ),
+        ),
+    ]
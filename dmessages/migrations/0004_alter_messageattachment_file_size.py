@@ -0,0 +1,18 @@
+# Generated by Django 6.0.4 on 2026-10-17 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dmessages", "0003_message_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="messageattachment",
+            name="file_size",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.4 on 2026-10-17 11:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_attachments_count(apps, schema_editor):
+    Message = apps.get_model("dmessages", "Message")
+    MessageAttachment = apps.get_model("dmessages", "MessageAttachment")
+    counts = (
+        MessageAttachment.objects.filter(message=OuterRef("pk"))
+        .order_by()
+        .values("message")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Message.objects.update(attachments_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dmessages", "0004_alter_messageattachment_file_size"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="attachments_count",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_attachments_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.4 on 2026-10-17 15:20
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("dmessages", "0005_message_attachments_count"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="message",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["conversation", "-created_at"],
+                name="dmsg_conv_live_created_idx",
+            ),
+        ),
+    ]
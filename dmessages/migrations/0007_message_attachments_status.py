@@ -0,0 +1,27 @@
+# Generated by Django 6.0.4 on 2026-10-18 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dmessages", "0006_message_conversation_live_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="attachments_status",
+            field=models.CharField(
+                choices=[
+                    ("none", "None"),
+                    ("processing", "Processing"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="none",
+                max_length=10,
+            ),
+        ),
+    ]
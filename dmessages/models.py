@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 
 class MessageAttachment(models.Model):
@@ -8,6 +8,19 @@ class MessageAttachment(models.Model):
         ("audio", "Audio"),
         ("file", "File"),
     ]
+    # Where a message's attachments are on their way to the worker that records them
+    UPLOAD_STATUS_CHOICES = [
+        ("none", "None"),
+        ("processing", "Processing"),
+        ("ready", "Ready"),
+        ("failed", "Failed"),
+    ]
+    # Maps the top-level MIME type to an attachment_type; anything else is a "file"
+    ATTACHMENT_TYPE_BY_MIME_PREFIX = {
+        "image": "image",
+        "video": "video",
+        "audio": "audio",
+    }
 
     message = models.ForeignKey(
         "Message", on_delete=models.CASCADE, related_name="attachments", null=True, blank=True
@@ -19,31 +32,63 @@ class MessageAttachment(models.Model):
         max_length=10, choices=ATTACHMENT_TYPE_CHOICES, default="image"
     )
     file = models.FileField(upload_to="message_attachments/")
-    file_size = models.BigIntegerField(null=True, blank=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
     original_filename = models.CharField(max_length=255, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def save(self, *args, **kwargs):
-        if self.file and not self.file_size:
-            try:
-                self.file_size = self.file.size  # type: ignore
-            except (OSError, ValueError):
-                pass
-        if self.file and not self.original_filename:
-            try:
-                self.original_filename = self.file.name
-            except (OSError, ValueError):
-                pass
-        super().save(*args, **kwargs)
+        # Only read metadata from a fresh upload, which is local; asking the
+        # storage for a stored file's size would be a remote round-trip.
+        # Rows saved without it are filled in by `manage.py backfill_attachment_metadata`.
+        if self.file and not self.file._committed:
+            upload = self.file.file
+            if not self.file_size:
+                self.file_size = upload.size
+            if not self.original_filename:
+                self.original_filename = upload.name
+        self.__dict__.pop('_file_url', None)
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding and self.message_id:
+                Message.add_attachments_count(self.message_id, 1)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            if self.message_id:
+                Message.add_attachments_count(self.message_id, -1)
+        return result
+
+    @classmethod
+    def bulk_create_for_message(cls, message_id, attachments, **message_fields):
+        """
+        Insert a Message's attachments and bump its attachments_count in one
+        transaction; `message_fields` are written to the Message alongside.
+        """
+        with transaction.atomic():
+            created = cls._default_manager.bulk_create(attachments, batch_size=50)
+            Message.add_attachments_count(message_id, len(created), **message_fields)
+        return created
+
+    @classmethod
+    def attachment_type_for(cls, content_type):
+        """Classify an upload by its top-level MIME type with a single lookup"""
+        prefix = content_type.split("/", 1)[0].lower()
+        return cls.ATTACHMENT_TYPE_BY_MIME_PREFIX.get(prefix, "file")
 
     def get_file_url(self):
-        """Generate the full URL for the file"""
-        if self.file:
-            try:
-                return self.file.url  # type: ignore
-            except (OSError, ValueError):
-                return None
-        return None
+        """Generate the full URL for the file, memoized on the instance"""
+        try:
+            return self._file_url
+        except AttributeError:
+            pass
+        # An empty name is the only case FieldFile.url raises for, so check it
+        # up front and ask the field's storage directly
+        name = self.file.name
+        url = self.file.storage.url(name) if name else None
+        self._file_url = url
+        return url
 
     def get_file_size_mb(self):
         """Get file size in MB"""
@@ -52,10 +97,11 @@ class MessageAttachment(models.Model):
         return None
 
     def __str__(self):
-        if self.message:
-            return f"{self.attachment_type} attachment for message {self.message.id}"  # type: ignore
-        elif self.conversation_message:
-            return f"{self.attachment_type} attachment for conversation message {self.conversation_message.id}"  # type: ignore
+        # Read the FK columns directly so stringifying never loads the parent row
+        if self.message_id:
+            return f"{self.attachment_type} attachment for message {self.message_id}"  # type: ignore
+        elif self.conversation_message_id:
+            return f"{self.attachment_type} attachment for conversation message {self.conversation_message_id}"  # type: ignore
         return f"{self.attachment_type} attachment"
 
 
@@ -68,9 +114,38 @@ class Message(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_read = models.BooleanField(default=False)  # type: ignore
     is_deleted = models.BooleanField(default=False)  # type: ignore
+    # Denormalized so list responses can skip the attachments lookup for plain messages
+    attachments_count = models.PositiveSmallIntegerField(default=0)
+    attachments_status = models.CharField(
+        max_length=10, choices=MessageAttachment.UPLOAD_STATUS_CHOICES, default='none'
+    )
 
     sender_ref = models.ForeignKey('users.User', on_delete=models.CASCADE, null=True, blank=True, related_name='sent_messages')
     recipient_ref = models.ForeignKey('users.User', on_delete=models.CASCADE, null=True, blank=True, related_name='received_messages')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['recipient_id', '-created_at'], name='msg_recip_created_idx'),
+            models.Index(fields=['sender_id', '-created_at'], name='msg_sender_created_idx'),
+            # Lets cursor pages of a conversation seek straight to the cursor;
+            # partial, since every conversation listing excludes deleted rows
+            models.Index(
+                fields=['conversation', '-created_at'],
+                name='dmsg_conv_live_created_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.sender_id} to {self.recipient_id}: {self.content}..."
+
+    @classmethod
+    def add_attachments_count(cls, message_id, delta, **fields):
+        """
+        The only place attachments_count changes. MessageAttachment's save(),
+        delete() and bulk_create_for_message() call it, rather than signals
+        that bulk_create skips and that would disable fast deletes.
+        """
+        return cls._default_manager.filter(id=message_id).update(
+            attachments_count=models.F('attachments_count') + delta, **fields
+        )
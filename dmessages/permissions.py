@@ -0,0 +1,28 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import BasePermission
+
+
+class AuthenticationRequired(APIException):
+    """
+    401 with the `{"error": ...}` body the message endpoints have always returned.
+
+    A plain NotAuthenticated would be downgraded to 403 by DRF, because
+    VerisafeAuthentication sends no WWW-Authenticate header.
+    """
+    status_code = status.HTTP_401_UNAUTHORIZED
+    default_code = "not_authenticated"
+
+    def __init__(self):
+        super().__init__({"error": "Authentication required"})
+
+
+class HasUserId(BasePermission):
+    """
+    Allows access only to requests that authentication resolved to a user id.
+    """
+
+    def has_permission(self, request, view):
+        if not getattr(request, "user_id", None):
+            raise AuthenticationRequired()
+        return True
@@ -1,7 +1,30 @@
+import copy
+from itertools import groupby
+from operator import attrgetter, itemgetter
+
+from django.core.files.storage import default_storage
+from django.db.models import Manager, QuerySet
 from rest_framework import serializers
 from .models import Message, MessageAttachment
 
-class MessageAttachmentSerializer(serializers.ModelSerializer):
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class instead of re-running model
+    introspection on every instantiation. Each instance gets fresh deep copies,
+    so binding a field to one serializer never leaks into another.
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = CachedFieldsMixin._fields_cache.get(cls)
+        if fields is None:
+            fields = CachedFieldsMixin._fields_cache[cls] = super().get_fields()
+        return {name: copy.deepcopy(field) for name, field in fields.items()}
+
+
+class MessageAttachmentSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     file_url = serializers.SerializerMethodField()
     file_size_mb = serializers.SerializerMethodField()
 
@@ -11,12 +34,13 @@ class MessageAttachmentSerializer(serializers.ModelSerializer):
 
     def get_file_url(self, obj):
         """Generate the full URL for the file"""
-        if obj.file:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
-        return None
+        url = obj.get_file_url()
+        if url is None:
+            return None
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(url)
+        return url
 
     def get_file_size_mb(self, obj):
         """Get file size in MB"""
@@ -32,38 +56,180 @@ class WhitespaceAllowedCharField(serializers.CharField):
         super().__init__(**kwargs)
 
     def to_internal_value(self, data: str | None) -> str:
+        if type(data) is str:
+            return data
         if data is None:
             raise serializers.ValidationError("This field may not be null.")
         return str(data)
 
-class MessageSerializer(serializers.ModelSerializer):
+
+class MessageListSerializer(serializers.ListSerializer):
+    """
+    Stream querysets through the child in chunks rather than filling the
+    queryset's result cache, and resolve the child's to_representation once.
+    """
+    chunk_size = 500
+
+    def to_representation(self, data):
+        if isinstance(data, Manager):
+            data = data.all()
+        # An already evaluated queryset (e.g. after prefetch_related or a
+        # paginator's len()) is iterated from memory instead of being re-run
+        if isinstance(data, QuerySet) and data._result_cache is None:
+            data = data.iterator(chunk_size=self.chunk_size)
+        to_representation = self.child.to_representation
+        return [to_representation(item) for item in data]
+
+
+class MessageSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     content = WhitespaceAllowedCharField(required=False)
     sender_id = serializers.CharField(read_only=True, max_length=100)
-    recipient_id = serializers.CharField(required=False, max_length=100)  # Make optional for updates
+    # Trims whitespace and rejects blank or over-long values itself; optional for updates
+    recipient_id = serializers.CharField(required=False, max_length=100)
     attachments = MessageAttachmentSerializer(many=True, read_only=True)
 
     class Meta:
         model = Message
         fields = ['id', 'sender_id', 'recipient_id', 'content', 'created_at', 'updated_at',
-                 'is_read', 'is_deleted', 'attachments', 'conversation']
-        read_only_fields = ['id', 'sender_id', 'created_at', 'updated_at']
+                 'is_read', 'is_deleted', 'attachments_count', 'attachments_status', 'attachments',
+                 'conversation']
+        read_only_fields = ['id', 'sender_id', 'created_at', 'updated_at', 'attachments_count',
+                            'attachments_status']
+        list_serializer_class = MessageListSerializer
+
+    # Reads every plain column in one C call instead of one getattr per field
+    _columns = attrgetter(
+        'id', 'sender_id', 'recipient_id', 'content', 'created_at', 'updated_at',
+        'is_read', 'is_deleted', 'attachments_count', 'attachments_status', 'conversation_id'
+    )
+
+    def to_representation(self, instance):
+        """Straight-line output for the fixed Meta.fields shape, skipping the per-field loop"""
+        if not isinstance(instance, Message):
+            # e.g. `.data` rendered from validated_data; let DRF resolve each field
+            return super().to_representation(instance)
+        (id_, sender_id, recipient_id, content, created_at, updated_at,
+         is_read, is_deleted, attachments_count, attachments_status,
+         conversation_id) = self._columns(instance)
+        return {
+            'id': id_,
+            'sender_id': sender_id,
+            'recipient_id': recipient_id,
+            'content': content,
+            'created_at': _format_datetime(created_at),
+            'updated_at': _format_datetime(updated_at),
+            'is_read': is_read,
+            'is_deleted': is_deleted,
+            'attachments_count': attachments_count,
+            'attachments_status': attachments_status,
+            'attachments': self.fields['attachments'].to_representation(
+                self._attachments_of(instance)
+            ),
+            'conversation': conversation_id,
+        }
+
+    @staticmethod
+    def _attachments_of(instance):
+        """
+        The prefetched attachments when the view loaded them, else a query.
+        The prefetch is what the DB returned, whereas attachments_count is
+        only a denormalized hint and can lag behind it.
+        """
+        prefetched = getattr(instance, '_prefetched_objects_cache', {})
+        if 'attachments' in prefetched:
+            return prefetched['attachments']
+        return instance.attachments.all()
 
     def validate_content(self, value):
         """Validate message content"""
-        if not value and (not self.instance or not self.instance.attachments.exists()):
+        if not value and (not self.instance or not self._instance_has_attachments()):
             raise serializers.ValidationError("Message content cannot be empty if there are no attachments.")
         return value
 
-    def validate_recipient_id(self, value):
-        """Validate recipient_id"""
-        # Allow empty recipient_id during updates (for conversation messages)
-        if self.instance and not value:
-            return value
+    def _instance_has_attachments(self):
+        """
+        Answer from the prefetch cache when the view loaded attachments, else
+        ask the DB. `.exists()` always bypasses the prefetch cache, so it is
+        only the fallback.
+        """
+        prefetched = getattr(self.instance, '_prefetched_objects_cache', {})
+        if 'attachments' in prefetched:
+            return bool(prefetched['attachments'])
+        return self.instance.attachments.exists()
+
+
+# Read-only fast path for message list responses. Produces the same shape as
+# MessageSerializer without going through per-field DRF machinery.
+MESSAGE_LIST_FIELDS = (
+    'id', 'sender_id', 'recipient_id', 'content', 'created_at', 'updated_at',
+    'is_read', 'is_deleted', 'attachments_count', 'attachments_status', 'conversation'
+)
+ATTACHMENT_LIST_FIELDS = (
+    'id', 'message_id', 'attachment_type', 'file', 'file_size', 'original_filename', 'created_at'
+)
+
+
+def _format_datetime(value):
+    """Match DRF's DateTimeField output for the UTC datetimes the DB returns"""
+    if value is None:
+        return None
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
 
-        if not value or not value.strip():
-            raise serializers.ValidationError("Recipient ID cannot be empty.")
+def fast_serialize_messages(rows):
+    """
+    Serialize Message rows fetched with `.values(*MESSAGE_LIST_FIELDS)`.
 
-        if len(value) > 100:
-            raise serializers.ValidationError("Recipient ID cannot exceed 100 characters.")
+    Attachments for all rows are loaded with a single query ordered by
+    message id and grouped in one pass. Datetimes are left as objects: both
+    ORJSONRenderer and DRF's JSONEncoder emit the same ISO-8601 `Z` form
+    DateTimeField would, without a per-row formatting call here.
+    """
+    rows = list(rows)
+    attachments_by_message = {}
+    # attachments_count lets plain-text pages skip the attachments query entirely
+    ids_with_attachments = [row['id'] for row in rows if row['attachments_count']]
+    if ids_with_attachments:
+        # Rows arrive sorted by message, so one groupby pass buckets them
+        attachment_rows = MessageAttachment._default_manager.filter(
+            message_id__in=ids_with_attachments
+        ).order_by('message_id', 'id').values(*ATTACHMENT_LIST_FIELDS)
+        attachments_by_message = {
+            message_id: list(group)
+            for message_id, group in groupby(attachment_rows, key=itemgetter('message_id'))
+        }
 
-        return value
\ No newline at end of file
+    url = default_storage.url
+    results = []
+    for row in rows:
+        results.append({
+            'id': row['id'],
+            'sender_id': row['sender_id'],
+            'recipient_id': row['recipient_id'],
+            'content': row['content'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+            'is_read': row['is_read'],
+            'is_deleted': row['is_deleted'],
+            'attachments_count': row['attachments_count'],
+            'attachments_status': row['attachments_status'],
+            'attachments': [
+                {
+                    'id': attachment['id'],
+                    'attachment_type': attachment['attachment_type'],
+                    'file_url': url(attachment['file']) if attachment['file'] else None,
+                    'file_size_mb': (
+                        round(attachment['file_size'] / (1024 * 1024), 2)
+                        if attachment['file_size'] else None
+                    ),
+                    'original_filename': attachment['original_filename'],
+                    'created_at': attachment['created_at'],
+                }
+                for attachment in attachments_by_message.get(row['id'], ())
+            ],
+            'conversation': row['conversation'],
+        })
+    return results
@@ -0,0 +1,152 @@
+from celery import Task, shared_task
+from celery.app.trace import logging
+from django.db import DatabaseError
+from django.db.models import Q
+from django.utils import timezone
+
+from dmessages.models import Message, MessageAttachment
+from utils.uploads import discard_staged_uploads
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_FILE_FIELD = MessageAttachment._meta.get_field("file")
+
+
+@shared_task(bind=True)
+def backfill_attachment_metadata(self, batch_size: int = 500, after_id: int = 0) -> int | None:
+    """
+    Fills in file_size and original_filename for attachments saved without
+    them, asking the storage backend off the request path. Run it through
+    `manage.py backfill_attachment_metadata`, which pages through every batch.
+
+    Args:
+        batch_size: Maximum number of attachments to process in one run.
+        after_id: Only attachments with a larger id are processed.
+
+    Returns:
+        The id of the last attachment examined, to pass as after_id for the
+        next batch, or None once no attachments are left.
+    """
+    attachments = list(MessageAttachment._default_manager.filter(
+        Q(file_size__isnull=True) | Q(original_filename__isnull=True),
+        id__gt=after_id,
+    ).exclude(file="").only(
+        "id", "file", "file_size", "original_filename"
+    ).order_by("id")[:batch_size])
+    if not attachments:
+        return None
+
+    updated = []
+    for attachment in attachments:
+        try:
+            if attachment.file_size is None:
+                attachment.file_size = attachment.file.size
+            if attachment.original_filename is None:
+                attachment.original_filename = attachment.file.name
+        except (OSError, ValueError) as e:
+            # Skipped rows keep their NULLs; paging by id stops them being retried forever
+            logger.warning(
+                f"Cannot read metadata for MessageAttachment id={attachment.id}: {e}"
+            )
+            continue
+        updated.append(attachment)
+
+    MessageAttachment._default_manager.bulk_update(
+        updated, ["file_size", "original_filename"]
+    )
+    return attachments[-1].id
+
+
+def mark_attachments_failed(message_id: int) -> None:
+    """
+    Tells the client polling attachments_status that the attachments of
+    Message message_id will never arrive.
+    """
+    try:
+        Message._default_manager.filter(id=message_id).update(
+            attachments_status="failed", updated_at=timezone.now()
+        )
+    except DatabaseError:
+        logger.exception(
+            f"Cannot mark attachments failed for Message id={message_id}."
+        )
+
+
+class PersistMessageAttachmentsTask(Task):
+    """
+    Marks the message's attachments failed once the task has failed for
+    good, whatever the exception, rather than leaving it "processing".
+    """
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        message_id = kwargs.get("message_id", args[0] if args else None)
+        logger.error(
+            f"Giving up on attachments for Message id={message_id}: {exc!r}"
+        )
+        mark_attachments_failed(message_id)
+
+
+def enqueue_persist_message_attachments(message_id: int, staged_files: list) -> None:
+    """
+    transaction.on_commit callback that queues persist_message_attachments;
+    if the broker is unreachable the message is marked failed instead.
+    """
+    try:
+        persist_message_attachments.delay(message_id, staged_files)
+    except Exception:
+        logger.exception(
+            f"Cannot queue attachments for Message id={message_id}."
+        )
+        mark_attachments_failed(message_id)
+
+
+@shared_task(
+    bind=True,
+    base=PersistMessageAttachmentsTask,
+    autoretry_for=(DatabaseError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def persist_message_attachments(self, message_id: int, staged_files: list) -> None:
+    """
+    Records attachment files staged in storage against a direct message.
+
+    The staged files are only deleted when the message no longer exists. On
+    any other failure they are kept for the retry. Once the task fails for
+    good, for whatever reason, the message's attachments_status is set to
+    "failed".
+
+    Args:
+        message_id: The primary key of the Message.
+        staged_files: Descriptions returned by utils.uploads.stage_upload.
+    """
+    messages = Message._default_manager.filter(id=message_id)
+    status = messages.values_list("attachments_status", flat=True).first()
+    if status is None:
+        logger.error(
+            f"Cannot persist attachments: Message with id={message_id} not found."
+        )
+        discard_staged_uploads(staged_files, ATTACHMENT_FILE_FIELD)
+        return
+    if status == "ready":
+        # An earlier attempt committed; the broker redelivered it
+        return
+
+    attachment_type_for = MessageAttachment.attachment_type_for
+    # The files are already in storage, so each row just names its file.
+    # update() skips auto_now, and updated_at feeds the inbox cache fingerprint
+    MessageAttachment.bulk_create_for_message(
+        message_id,
+        [
+            MessageAttachment(
+                message_id=message_id,
+                file=staged["stored_name"],
+                attachment_type=attachment_type_for(staged["content_type"]),
+                file_size=staged["size"],
+                original_filename=staged["name"],
+            )
+            for staged in staged_files
+        ],
+        attachments_status="ready",
+        updated_at=timezone.now(),
+    )
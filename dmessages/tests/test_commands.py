@@ -0,0 +1,42 @@
+from io import StringIO
+from unittest.mock import PropertyMock, patch
+
+from django.core.management import call_command
+from django.db.models.fields.files import FieldFile
+from django.test import TestCase
+
+from ..models import Message, MessageAttachment
+
+
+class BackfillAttachmentMetadataCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        message = Message.objects.create(sender_id='user123', recipient_id='user456', content='Hi')
+        # A stored file name, so save() has no upload to read metadata from
+        cls.missing = MessageAttachment.objects.create(
+            message=message, file='message_attachments/photo.png'
+        )
+        cls.complete = MessageAttachment.objects.create(
+            message=message, file='message_attachments/doc.pdf',
+            file_size=10, original_filename='doc.pdf'
+        )
+
+    def test_fills_missing_metadata_from_storage(self):
+        """Test rows without metadata are filled in and complete rows are left alone."""
+        with patch.object(FieldFile, 'size', new_callable=PropertyMock, return_value=2048) as size:
+            call_command('backfill_attachment_metadata', batch_size=1, stdout=StringIO())
+
+        self.assertEqual(size.call_count, 1)
+        self.missing.refresh_from_db()
+        self.assertEqual(self.missing.file_size, 2048)
+        self.assertEqual(self.missing.original_filename, 'message_attachments/photo.png')
+        self.complete.refresh_from_db()
+        self.assertEqual(self.complete.file_size, 10)
+
+    def test_unreadable_files_do_not_stall_the_run(self):
+        """Test a file the storage cannot read is skipped instead of retried forever."""
+        with patch.object(FieldFile, 'size', new_callable=PropertyMock, side_effect=OSError('gone')):
+            call_command('backfill_attachment_metadata', stdout=StringIO())
+
+        self.missing.refresh_from_db()
+        self.assertIsNone(self.missing.file_size)
@@ -1,4 +1,4 @@
-import json
+import functools
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
@@ -8,56 +8,72 @@ from ..models import Message
 import unittest
 
 
+@functools.lru_cache(maxsize=16)
+def _test_token(user_id):
+    """Sign one token per user for the whole run; the payload never changes."""
+    return generate_test_token(user_id)
+
+
 @unittest.skip("JWT authentication disabled for development")
 class MessagesEndpointTest(TestCase):
-    def setUp(self):
-        """Set up test data for each test method."""
-        self.client = APIClient()
-        self.messages_url = '/messages/'
-        self.test_user_id = 'user123'
-        self.test_user_id_2 = 'user456'
-        self.valid_message_data = {
-            'recipient_id': self.test_user_id_2,
+    client_class = APIClient
+    messages_url = '/messages/'
+    test_user_id = 'user123'
+    test_user_id_2 = 'user456'
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the read-only inbox fixtures once for the whole class."""
+        cls.fixture_messages = Message.objects.bulk_create([
+            Message(
+                sender_id='sender1',
+                recipient_id=cls.test_user_id,
+                content='Message for user123'
+            ),
+            Message(
+                sender_id='sender2',
+                recipient_id=cls.test_user_id,
+                content='Another message for user123'
+            ),
+            Message(
+                sender_id='sender2',
+                recipient_id=cls.test_user_id_2,
+                content='Message for user456'
+            ),
+            # Not addressed to either test user, so never listed for them
+            Message(
+                sender_id='sender3',
+                recipient_id='other_user',
+                content='Message for other_user'
+            ),
+        ])
+        cls.message1, cls.message2, cls.message3, cls.other_message = cls.fixture_messages
+
+        # Attributes assigned here are deep-copied per test, so tests may mutate them
+        cls.valid_message_data = {
+            'recipient_id': cls.test_user_id_2,
             'content': 'Hello, this is a test message!'
         }
 
-    def _get_auth_headers(self, user_id=None):
-        """Helper method to get authentication headers using real JWT tokens."""
+    def setUp(self):
+        """Authenticate the client as the default test user."""
+        self._authenticate()
+
+    def _authenticate(self, user_id=None):
+        """Send a real JWT for `user_id` on every following request."""
         user_id = user_id or self.test_user_id
-        token = generate_test_token(user_id)
-        return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {_test_token(user_id)}')
 
     def test_get_messages_with_valid_jwt(self):
         """Test GET /messages/ with valid JWT token."""
-        # Create messages where user123 is the recipient
-        Message.objects.create(
-            sender_id='sender1',
-            recipient_id=self.test_user_id,
-            content='Message 1'
-        )
-        Message.objects.create(
-            sender_id='sender2',
-            recipient_id=self.test_user_id,
-            content='Message 2'
-        )
-
-        # Create a message where user123 is NOT the recipient (should be filtered out)
-        Message.objects.create(
-            sender_id='sender3',
-            recipient_id='other_user',
-            content='Message 3'
-        )
-
-        response = self.client.get(
-            self.messages_url,
-            **self._get_auth_headers()
-        )
+        response = self.client.get(self.messages_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # Only messages for user123
+        self.assertEqual(len(response.data['results']), 2)  # Only messages for user123
 
     def test_get_messages_without_jwt(self):
         """Test GET /messages/ without JWT token returns 401."""
+        self.client.credentials()
         response = self.client.get(self.messages_url)
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -65,64 +81,38 @@ class MessagesEndpointTest(TestCase):
 
     def test_get_messages_with_invalid_jwt(self):
         """Test GET /messages/ with invalid JWT token returns 401."""
-        response = self.client.get(
-            self.messages_url,
-            HTTP_AUTHORIZATION='Bearer invalid_token_here'
-        )
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalid_token_here')
+        response = self.client.get(self.messages_url)
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertIn('error', response.json())
 
     def test_get_messages_filters_by_recipient(self):
         """Test GET /messages/ only returns messages for authenticated user."""
-        # Create messages for different recipients
-        Message.objects.create(
-            sender_id='sender1',
-            recipient_id=self.test_user_id,
-            content='Message for user123'
-        )
-        Message.objects.create(
-            sender_id='sender2',
-            recipient_id=self.test_user_id_2,
-            content='Message for user456'
-        )
-
-        response = self.client.get(
-            self.messages_url,
-            **self._get_auth_headers()
-        )
+        response = self.client.get(self.messages_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['content'], 'Message for user123')
-
-    def test_get_messages_empty_database(self):
-        """Test GET /messages/ with empty database returns empty list."""
-        response = self.client.get(
-            self.messages_url,
-            **self._get_auth_headers()
+        self.assertEqual(
+            {message['content'] for message in response.data['results']},
+            {'Message for user123', 'Another message for user123'}
         )
 
+    def test_get_messages_empty_inbox(self):
+        """Test GET /messages/ for a user with no messages returns empty list."""
+        self._authenticate('user_without_messages')
+        response = self.client.get(self.messages_url)
+
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, [])
+        self.assertEqual(response.data['results'], [])
 
     def test_get_messages_response_format(self):
         """Test GET /messages/ returns proper response format."""
-        message = Message.objects.create(
-            sender_id='sender1',
-            recipient_id=self.test_user_id,
-            content='Test message'
-        )
-
-        response = self.client.get(
-            self.messages_url,
-            **self._get_auth_headers()
-        )
+        response = self.client.get(self.messages_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 2)
 
-        message_data = response.data[0]
+        message_data = response.data['results'][0]
         expected_fields = ['id', 'sender_id', 'recipient_id', 'content', 'created_at']
         for field in expected_fields:
             self.assertIn(field, message_data)
@@ -131,91 +121,87 @@ class MessagesEndpointTest(TestCase):
         """Test POST /messages/ with valid JWT token creates message."""
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(self.valid_message_data),
-            content_type='application/json',
-            **self._get_auth_headers()
+            self.valid_message_data,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(Message.objects.count(), 1)
+        self.assertEqual(Message.objects.count(), len(self.fixture_messages) + 1)
 
-        created_message = Message.objects.first()
-        self.assertEqual(created_message.content, 'Hello, this is a test message!')
-        self.assertEqual(created_message.sender_id, self.test_user_id)
-        self.assertEqual(created_message.recipient_id, self.test_user_id_2)
+        # The count above proves the row was stored; the response echoes what was saved
+        self.assertEqual(response.data['content'], 'Hello, this is a test message!')
+        self.assertEqual(response.data['sender_id'], self.test_user_id)
+        self.assertEqual(response.data['recipient_id'], self.test_user_id_2)
 
     def test_post_message_without_jwt(self):
         """Test POST /messages/ without JWT token returns 401."""
+        self.client.credentials()
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(self.valid_message_data),
-            content_type='application/json'
+            self.valid_message_data,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-        self.assertEqual(Message.objects.count(), 0)
+        self.assertEqual(Message.objects.count(), len(self.fixture_messages))
 
     def test_post_message_with_invalid_jwt(self):
         """Test POST /messages/ with invalid JWT token returns 401."""
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalid_token_here')
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(self.valid_message_data),
-            content_type='application/json',
-            HTTP_AUTHORIZATION='Bearer invalid_token_here'
+            self.valid_message_data,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-        self.assertEqual(Message.objects.count(), 0)
+        self.assertEqual(Message.objects.count(), len(self.fixture_messages))
 
     def test_post_message_invalid_data(self):
         """Test POST /messages/ with invalid data returns 400."""
         invalid_data = {'content': ''}  # Empty content
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(invalid_data),
-            content_type='application/json',
-            **self._get_auth_headers()
+            invalid_data,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('content', response.data)
-        self.assertEqual(Message.objects.count(), 0)
+        self.assertEqual(Message.objects.count(), len(self.fixture_messages))
 
     def test_post_message_missing_recipient(self):
         """Test POST /messages/ with missing recipient returns 400."""
         invalid_data = {'content': 'Hello'}
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(invalid_data),
-            content_type='application/json',
-            **self._get_auth_headers()
+            invalid_data,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('recipient_id', response.data)
-        self.assertEqual(Message.objects.count(), 0)
+        self.assertEqual(Message.objects.count(), len(self.fixture_messages))
 
     def test_post_message_empty_recipient(self):
         """Test POST /messages/ with empty recipient returns 400."""
         invalid_data = {'recipient_id': '', 'content': 'Hello'}
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(invalid_data),
-            content_type='application/json',
-            **self._get_auth_headers()
+            invalid_data,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('recipient_id', response.data)
-        self.assertEqual(Message.objects.count(), 0)
+        self.assertEqual(Message.objects.count(), len(self.fixture_messages))
 
     def test_post_message_response_format(self):
         """Test POST /messages/ returns proper response format."""
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(self.valid_message_data),
-            content_type='application/json',
-            **self._get_auth_headers()
+            self.valid_message_data,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -226,12 +212,12 @@ class MessagesEndpointTest(TestCase):
     def test_post_message_sender_id_from_jwt(self):
         """Test POST /messages/ assigns sender_id from JWT token."""
         test_user_id = 'jwt_user_456'
+        self._authenticate(test_user_id)
 
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(self.valid_message_data),
-            content_type='application/json',
-            **self._get_auth_headers(test_user_id)
+            self.valid_message_data,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -244,9 +230,8 @@ class MessagesEndpointTest(TestCase):
 
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(data_with_sender_id),
-            content_type='application/json',
-            **self._get_auth_headers()
+            data_with_sender_id,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -262,9 +247,8 @@ class MessagesEndpointTest(TestCase):
         }
         response = self.client.post(
             self.messages_url,
-            data=json.dumps(whitespace_data),
-            content_type='application/json',
-            **self._get_auth_headers()
+            whitespace_data,
+            format='json'
         )
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -275,70 +259,43 @@ class MessagesEndpointTest(TestCase):
         # Test PUT
         response = self.client.put(
             self.messages_url,
-            data=json.dumps(self.valid_message_data),
-            content_type='application/json',
-            **self._get_auth_headers()
+            self.valid_message_data,
+            format='json'
         )
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
         # Test DELETE
-        response = self.client.delete(
-            self.messages_url,
-            **self._get_auth_headers()
-        )
+        response = self.client.delete(self.messages_url)
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
     def test_content_type_handling(self):
-        """Test different content types are handled properly."""
-        # Test with form data (should work)
-        response = self.client.post(
-            self.messages_url,
-            data=self.valid_message_data,
-            **self._get_auth_headers()
-        )
-
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        """Test form and JSON request bodies are both accepted."""
+        for request_format in ('multipart', 'json'):
+            with self.subTest(format=request_format):
+                response = self.client.post(
+                    self.messages_url,
+                    self.valid_message_data,
+                    format=request_format
+                )
 
-        # Test with JSON (should also work)
-        response = self.client.post(
-            self.messages_url,
-            data=json.dumps(self.valid_message_data),
-            content_type='application/json',
-            **self._get_auth_headers()
-        )
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Message.objects.count(), len(self.fixture_messages) + 2)
 
     def test_message_privacy(self):
         """Test that users can only see messages addressed to them."""
-        # Create messages for different users
-        Message.objects.create(
-            sender_id='sender1',
-            recipient_id=self.test_user_id,
-            content='Message for user123'
-        )
-        Message.objects.create(
-            sender_id='sender2',
-            recipient_id=self.test_user_id_2,
-            content='Message for user456'
-        )
-
         # Test user123 can only see their messages
-        response = self.client.get(
-            self.messages_url,
-            **self._get_auth_headers(self.test_user_id)
-        )
+        response = self.client.get(self.messages_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['content'], 'Message for user123')
+        self.assertEqual(len(response.data['results']), 2)
+        for message in response.data['results']:
+            self.assertEqual(message['recipient_id'], self.test_user_id)
 
         # Test user456 can only see their messages
-        response = self.client.get(
-            self.messages_url,
-            **self._get_auth_headers(self.test_user_id_2)
-        )
+        self._authenticate(self.test_user_id_2)
+        response = self.client.get(self.messages_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['content'], 'Message for user456')
\ No newline at end of file
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['content'], 'Message for user456')
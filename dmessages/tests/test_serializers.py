@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from rest_framework.test import APIRequestFactory
 from rest_framework import status
 from ..models import Message
@@ -6,17 +6,41 @@ from ..serializers import MessageSerializer, WhitespaceAllowedCharField
 import unittest
 
 
+class MessageSerializerRepresentationTest(SimpleTestCase):
+    """to_representation paths that never reach the database."""
+
+    def test_validated_data_falls_back_to_field_serialization(self):
+        """Test .data before save renders the validated dict instead of failing."""
+        serializer = MessageSerializer(data={'recipient_id': 'user456', 'content': 'Hi'})
+        self.assertTrue(serializer.is_valid())
+
+        self.assertEqual(serializer.data['recipient_id'], 'user456')
+        self.assertEqual(serializer.data['content'], 'Hi')
+
+    def test_prefetched_attachments_win_over_the_counter(self):
+        """Test an empty prefetch is rendered as-is even when the counter disagrees."""
+        message = Message(id=1, sender_id='user123', recipient_id='user456', attachments_count=2)
+        message._prefetched_objects_cache = {'attachments': []}
+
+        self.assertEqual(MessageSerializer(message).data['attachments'], [])
+
+
 @unittest.skip("JWT authentication disabled for development")
 class MessageSerializerTest(TestCase):
-    def setUp(self):
-        """Set up test data for each test method."""
-        self.factory = APIRequestFactory()
-        self.valid_message_data = {
+    long_content = 'This is a very long message. ' * 100  # About 3000 characters
+    special_content = 'Hello! 🌟 This has émojis and spécial chars: @#$%^&*()'
+
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once; Django hands each test its own copy."""
+        cls.valid_message_data = {
             'sender_id': 'user123',
             'recipient_id': 'user456',
             'content': 'Hello, this is a test message!'
         }
-        self.valid_serializer_data = {
+        cls.valid_serializer_data = {
             'recipient_id': 'user456',
             'content': 'Hello, this is a test message!'
         }
@@ -150,27 +174,25 @@ class MessageSerializerTest(TestCase):
 
     def test_serializer_special_characters(self):
         """Test serializer handles special characters in content."""
-        special_content = 'Hello! 🌟 This has émojis and spécial chars: @#$%^&*()'
-        data = {'recipient_id': 'user456', 'content': special_content}
+        data = {'recipient_id': 'user456', 'content': self.special_content}
         serializer = MessageSerializer(data=data)
         self.assertTrue(serializer.is_valid())
 
         # Mock sender_id assignment
         serializer.validated_data['sender_id'] = 'user123'
         message = serializer.save()
-        self.assertEqual(message.content, special_content)
+        self.assertEqual(message.content, self.special_content)
 
     def test_serializer_long_content(self):
         """Test serializer handles very long content."""
-        long_content = 'This is a very long message. ' * 100  # About 3000 characters
-        data = {'recipient_id': 'user456', 'content': long_content}
+        data = {'recipient_id': 'user456', 'content': self.long_content}
         serializer = MessageSerializer(data=data)
         self.assertTrue(serializer.is_valid())
 
         # Mock sender_id assignment
         serializer.validated_data['sender_id'] = 'user123'
         message = serializer.save()
-        self.assertEqual(len(message.content), len(long_content))
+        self.assertEqual(len(message.content), len(self.long_content))
 
     def test_serializer_same_sender_recipient(self):
         """Test serializer allows same sender and recipient (self-message)."""
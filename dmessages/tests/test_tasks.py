@@ -0,0 +1,51 @@
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase, TestCase
+
+from utils.uploads import stage_uploads
+from ..models import Message
+from ..tasks import (
+    enqueue_persist_message_attachments,
+    persist_message_attachments,
+)
+
+
+class PersistMessageAttachmentsFailureTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.message = Message.objects.create(
+            sender_id='user123', recipient_id='user456', attachments_status='processing'
+        )
+
+    def assertFailed(self):
+        self.message.refresh_from_db(fields=['attachments_status'])
+        self.assertEqual(self.message.attachments_status, 'failed')
+
+    def test_final_failure_marks_the_message_failed(self):
+        """Test any exception that ends the task leaves the message failed, not processing."""
+        persist_message_attachments.on_failure(
+            RuntimeError('boom'), 'task-id', (self.message.id, []), {}, None
+        )
+
+        self.assertFailed()
+
+    def test_unreachable_broker_marks_the_message_failed(self):
+        """Test a message whose task cannot be queued is marked failed."""
+        with patch.object(persist_message_attachments, 'delay', side_effect=ConnectionError):
+            enqueue_persist_message_attachments(self.message.id, [])
+
+        self.assertFailed()
+
+
+class StageUploadsTest(SimpleTestCase):
+    def test_partial_staging_is_rolled_back(self):
+        """Test files staged before a failing upload are deleted again."""
+        staged = {'stored_name': 'message_attachments/a.png'}
+        storage = Mock()
+        field = Mock(storage=storage)
+
+        with patch('utils.uploads.stage_upload', side_effect=[staged, OSError('disk full')]):
+            with self.assertRaises(OSError):
+                stage_uploads([Mock(), Mock()], field)
+
+        storage.delete.assert_called_once_with('message_attachments/a.png')
@@ -1,35 +1,124 @@
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase, override_settings
 from rest_framework.test import APIRequestFactory
 from rest_framework import status
 from unittest.mock import Mock, patch
-from ..models import Message
-from ..views import MessageListCreateView
+from conversations.models import Conversation
+from ..models import Message, MessageAttachment
+from ..views import (
+    MAX_BULK_READ_IDS,
+    ConversationMessageListView,
+    MessageBulkReadView,
+    MessageListCreateView,
+)
 from ..serializers import MessageSerializer
+from chirp.verisafe_authentication import VerisafeAuthentication
 import unittest
 
+_VIEW = MessageListCreateView.as_view()
+
+
+class AuthenticatedRequestMixin:
+    """
+    Accept every request as authenticated, so tests set `request.user_id`
+    themselves instead of minting a Verisafe JWT.
+    """
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(
+            VerisafeAuthentication, 'authenticate', return_value=(AnonymousUser(), None)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class MessageListQueryCountTest(AuthenticatedRequestMixin, TestCase):
+    factory = APIRequestFactory()
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'message-list-query-count',
+    }})
+    def test_get_messages_query_count(self):
+        """Test GET query count does not grow with the number of messages."""
+        Message.objects.bulk_create([
+            Message(sender_id=f'sender{i}', recipient_id='user123', content=f'Message {i}')
+            for i in range(5)
+        ])
+
+        request = self.factory.get('/messages/')
+        request.user_id = 'user123'
+
+        # Inbox fingerprint (which also counts the page set) and page rows;
+        # plain messages skip the attachments query
+        with self.assertNumQueries(2):
+            response = _VIEW(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # An unchanged inbox is served from the cache after the fingerprint query
+        request = self.factory.get('/messages/')
+        request.user_id = 'user123'
+        with self.assertNumQueries(1):
+            response = _VIEW(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+    @override_settings(
+        CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'message-list-hosts',
+        }},
+        ALLOWED_HOSTS=['api.example.com', 'internal.example.com'],
+    )
+    def test_cached_page_links_follow_the_request_host(self):
+        """Test a page cached through one host is not served with its links to another."""
+        Message.objects.bulk_create([
+            Message(sender_id=f'sender{i}', recipient_id='user123', content=f'Message {i}')
+            for i in range(2)
+        ])
+
+        for host in ('api.example.com', 'internal.example.com'):
+            request = self.factory.get('/messages/', {'page_size': 1}, HTTP_HOST=host)
+            request.user_id = 'user123'
+            response = _VIEW(request)
+            self.assertTrue(response.data['next'].startswith(f'http://{host}/'))
+
 
 @unittest.skip("JWT authentication disabled for development")
 class MessageListCreateViewTest(TestCase):
-    def setUp(self):
-        """Set up test data for each test method."""
-        self.factory = APIRequestFactory()
-        self.view = MessageListCreateView.as_view()
-        self.valid_message_data = {
+    long_content = 'This is a very long message. ' * 100  # About 3000 characters
+    special_content = 'Hello! 🌟 This has émojis and spécial chars: @#$%^&*()'
+
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once; Django hands each test its own copy."""
+        cls.view = _VIEW
+        cls.valid_message_data = {
             'sender_id': 'user123',
             'recipient_id': 'user456',
             'content': 'Hello, this is a test message!'
         }
-        self.valid_request_data = {
+        cls.valid_request_data = {
             'recipient_id': 'user456',
             'content': 'Hello, this is a test message!'
         }
 
+    def _handle(self, request):
+        """Call the view's handler directly, skipping DRF's dispatch."""
+        view = MessageListCreateView()
+        view.setup(request)
+        drf_request = view.initialize_request(request)
+        return getattr(view, request.method.lower())(drf_request)
+
     def test_get_empty_messages(self):
         """Test GET request with no messages for user."""
         request = self.factory.get('/messages/')
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, [])
@@ -56,7 +145,7 @@ class MessageListCreateViewTest(TestCase):
         request = self.factory.get('/messages/')
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)  # Only messages for user123
@@ -80,7 +169,7 @@ class MessageListCreateViewTest(TestCase):
         request = self.factory.get('/messages/')
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
@@ -94,7 +183,7 @@ class MessageListCreateViewTest(TestCase):
         request = self.factory.get('/messages/')
         request.user_id = 'user456'  # Recipient of the message
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
@@ -130,7 +219,7 @@ class MessageListCreateViewTest(TestCase):
         request = self.factory.get('/messages/')
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 3)
@@ -140,6 +229,7 @@ class MessageListCreateViewTest(TestCase):
         request = self.factory.post('/messages/', self.valid_request_data)
         request.user_id = 'user123'
 
+        # Goes through as_view() so dispatch, permissions and rendering stay covered
         response = self.view(request)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -155,63 +245,39 @@ class MessageListCreateViewTest(TestCase):
         request = self.factory.post('/messages/', self.valid_request_data)
         request.user_id = 'authenticated_user'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['sender_id'], 'authenticated_user')
 
     def test_post_invalid_data(self):
-        """Test POST request with invalid data returns 400."""
-        invalid_data = {'recipient_id': '', 'content': ''}
-        request = self.factory.post('/messages/', invalid_data)
-        request.user_id = 'user123'
-
-        response = self.view(request)
-
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('recipient_id', response.data)
-        self.assertIn('content', response.data)
-        self.assertEqual(Message.objects.count(), 0)
-
-    def test_post_missing_content(self):
-        """Test POST request with missing content field."""
-        invalid_data = {'recipient_id': 'user456'}
-        request = self.factory.post('/messages/', invalid_data)
-        request.user_id = 'user123'
-
-        response = self.view(request)
-
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('content', response.data)
-
-    def test_post_missing_recipient_id(self):
-        """Test POST request with missing recipient_id field."""
-        invalid_data = {'content': 'Test message'}
-        request = self.factory.post('/messages/', invalid_data)
-        request.user_id = 'user123'
-
-        response = self.view(request)
+        """Test POST request with invalid data returns 400 naming each bad field."""
+        cases = (
+            ({'recipient_id': '', 'content': ''}, ('recipient_id', 'content')),
+            ({'recipient_id': 'user456'}, ('content',)),
+            ({'content': 'Test message'}, ('recipient_id',)),
+            ({'recipient_id': 'user456', 'content': ''}, ('content',)),
+            ({'recipient_id': 'x' * 101, 'content': 'Test message'}, ('recipient_id',)),
+        )
+        for invalid_data, fields in cases:
+            with self.subTest(data=invalid_data):
+                request = self.factory.post('/messages/', invalid_data)
+                request.user_id = 'user123'
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('recipient_id', response.data)
+                response = self._handle(request)
 
-    def test_post_empty_content(self):
-        """Test POST request with empty content."""
-        invalid_data = {'recipient_id': 'user456', 'content': ''}
-        request = self.factory.post('/messages/', invalid_data)
-        request.user_id = 'user123'
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                for field in fields:
+                    self.assertIn(field, response.data)
 
-        response = self.view(request)
-
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('content', response.data)
+        self.assertEqual(Message.objects.count(), 0)
 
     def test_post_response_format(self):
         """Test POST request returns proper response format."""
         request = self.factory.post('/messages/', self.valid_request_data)
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         expected_fields = ['id', 'sender_id', 'recipient_id', 'content', 'created_at']
@@ -224,7 +290,7 @@ class MessageListCreateViewTest(TestCase):
         request = self.factory.post('/messages/', original_data)
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         # Original data should not have sender_id
@@ -239,7 +305,7 @@ class MessageListCreateViewTest(TestCase):
         request = self.factory.post('/messages/', self_message_data)
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         created_message = Message.objects.first()
@@ -258,8 +324,8 @@ class MessageListCreateViewTest(TestCase):
         request2 = self.factory.post('/messages/', request2_data)
         request2.user_id = 'user123'
 
-        response1 = self.view(request1)
-        response2 = self.view(request2)
+        response1 = self._handle(request1)
+        response2 = self._handle(request2)
 
         self.assertEqual(response1.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response2.status_code, status.HTTP_201_CREATED)
@@ -267,42 +333,40 @@ class MessageListCreateViewTest(TestCase):
 
     def test_post_long_content(self):
         """Test POST request with very long content."""
-        long_content = 'This is a very long message. ' * 100
         long_message_data = {
             'recipient_id': 'user456',
-            'content': long_content
+            'content': self.long_content
         }
         request = self.factory.post('/messages/', long_message_data)
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(len(response.data['content']), len(long_content))
+        self.assertEqual(len(response.data['content']), len(self.long_content))
 
     def test_post_special_characters(self):
         """Test POST request with special characters in content."""
-        special_content = 'Hello! 🌟 This has émojis and spécial chars: @#$%^&*()'
         special_message_data = {
             'recipient_id': 'user456',
-            'content': special_content
+            'content': self.special_content
         }
         request = self.factory.post('/messages/', special_message_data)
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(response.data['content'], special_content)
+        self.assertEqual(response.data['content'], self.special_content)
 
     def test_view_uses_correct_serializer(self):
-        """Test that view uses MessageSerializer."""
+        """Test that GET uses the read-only fast serializer."""
         request = self.factory.get('/messages/')
         request.user_id = 'user123'
 
-        with patch('dmessages.views.MessageSerializer') as mock_serializer:
-            mock_serializer.return_value.data = []
-            response = self.view(request)
+        with patch('dmessages.views.fast_serialize_messages') as mock_serializer:
+            mock_serializer.return_value = []
+            response = self._handle(request)
             mock_serializer.assert_called()
 
     def test_get_queryset_filters_correctly(self):
@@ -322,23 +386,110 @@ class MessageListCreateViewTest(TestCase):
         request = self.factory.get('/messages/')
         request.user_id = 'user123'
 
-        response = self.view(request)
+        response = self._handle(request)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)  # Only the received message
         self.assertEqual(response.data[0]['content'], 'Received by user123')
         self.assertEqual(response.data[0]['recipient_id'], 'user123')
 
-    def test_post_recipient_id_too_long(self):
-        """Test POST request with recipient_id exceeding max length."""
-        invalid_data = {
-            'recipient_id': 'x' * 101,
-            'content': 'Test message'
-        }
-        request = self.factory.post('/messages/', invalid_data)
+
+class ConversationMessageListViewTest(AuthenticatedRequestMixin, TestCase):
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.view = ConversationMessageListView.as_view()
+        cls.conversation = Conversation.objects.create(
+            conversation_id='conv_test', participants=['user123', 'user456']
+        )
+        messages = Message.objects.bulk_create([
+            Message(
+                conversation=cls.conversation,
+                sender_id='user456',
+                recipient_id='user123',
+                content=f'Message {i}'
+            )
+            for i in range(5)
+        ])
+        # create() goes through save(), which keeps attachments_count in step
+        for message in messages:
+            MessageAttachment.objects.create(
+                message=message, file='message_attachments/photo.png', attachment_type='image'
+            )
+
+    def test_get_messages_query_count(self):
+        """Test attachments for a whole page are loaded in one query."""
+        request = self.factory.get(f'/messages/conversation/{self.conversation.id}/')
+        request.user_id = 'user123'
+
+        # Conversation lookup, cursor page and one prefetch for every message's attachments
+        with self.assertNumQueries(3):
+            response = self.view(request, conversation_id=self.conversation.id)
+            self.assertEqual(len(response.data['messages']), 5)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for message in response.data['messages']:
+            self.assertEqual(len(message['attachments']), 1)
+
+
+class MessageBulkReadViewTest(AuthenticatedRequestMixin, TestCase):
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.view = MessageBulkReadView.as_view()
+        cls.unread, cls.other_unread, cls.not_mine = Message.objects.bulk_create([
+            Message(sender_id='user456', recipient_id='user123', content='First'),
+            Message(sender_id='user456', recipient_id='user123', content='Second'),
+            Message(sender_id='user123', recipient_id='user456', content='Sent by me'),
+        ])
+
+    def test_marks_only_own_messages_in_one_query(self):
+        """Test a batch of ids is acked with a single UPDATE scoped to the recipient."""
+        request = self.factory.put(
+            '/messages/read/',
+            {'message_ids': [self.unread.id, self.other_unread.id, self.not_mine.id]},
+            format='json'
+        )
+        request.user_id = 'user123'
+
+        with self.assertNumQueries(1):
+            response = self.view(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'updated': 2})
+        self.assertFalse(Message.objects.get(id=self.not_mine.id).is_read)
+
+    def test_rejects_non_list_ids(self):
+        """Test message_ids must be a list of integers."""
+        request = self.factory.put('/messages/read/', {'message_ids': 'all'}, format='json')
+        request.user_id = 'user123'
+
+        response = self.view(request)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_boolean_ids(self):
+        """Test booleans are not accepted as integer ids."""
+        request = self.factory.put('/messages/read/', {'message_ids': [True]}, format='json')
         request.user_id = 'user123'
 
         response = self.view(request)
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('recipient_id', response.data)
\ No newline at end of file
+        self.assertFalse(Message.objects.get(id=self.unread.id).is_read)
+
+    def test_rejects_too_many_ids(self):
+        """Test a batch larger than MAX_BULK_READ_IDS is refused without touching the DB."""
+        request = self.factory.put(
+            '/messages/read/',
+            {'message_ids': list(range(1, MAX_BULK_READ_IDS + 2))},
+            format='json'
+        )
+        request.user_id = 'user123'
+
+        with self.assertNumQueries(0):
+            response = self.view(request)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import MessageListCreateView, MessageDetailView, MessageReadView, MessageEditView, MessageDeleteView, ConversationMessageListView
+from .views import MessageListCreateView, MessageDetailView, MessageReadView, MessageBulkReadView, MessageEditView, MessageDeleteView, ConversationMessageListView
 
 urlpatterns = [
     path('', MessageListCreateView.as_view(), name='message-list-create'),
+    path('read/', MessageBulkReadView.as_view(), name='message-bulk-read'),
     path('<int:pk>/', MessageDetailView.as_view(), name='message-detail'),
     path('<int:pk>/read/', MessageReadView.as_view(), name='message-read'),
     path('<int:pk>/edit/', MessageEditView.as_view(), name='message-edit'),
@@ -1,37 +1,82 @@
+from functools import partial
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from django.core.paginator import Paginator
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Prefetch, Q, Sum
 
+from chirp.pagination import CreatedAtCursorPagination
 from conversations.models import Conversation
 from .models import Message, MessageAttachment
-from .serializers import MessageSerializer
+from .permissions import HasUserId
+from .serializers import MESSAGE_LIST_FIELDS, MessageSerializer, fast_serialize_messages
+from .tasks import ATTACHMENT_FILE_FIELD, enqueue_persist_message_attachments
+from utils.uploads import discard_staged_uploads, stage_uploads
 from django.utils import timezone
 from datetime import timedelta
 
+MESSAGE_LIST_CACHE_TIMEOUT = 300
+# Upper bound on ids acked by one bulk-read request, keeping the IN list bounded
+MAX_BULK_READ_IDS = 500
+
+
+def attachments_prefetch(parent_field="message"):
+    """
+    Prefetch for the `attachments` relation that loads only the columns
+    MessageAttachmentSerializer reads, plus the FK used to stitch rows back.
+    """
+    return Prefetch(
+        "attachments",
+        queryset=MessageAttachment._default_manager.only(
+            "id", parent_field, "attachment_type", "file", "file_size",
+            "original_filename", "created_at"
+        ),
+    )
+
+
 class MessageListCreateView(APIView):
-    def get(self, request):
-        if not hasattr(request, 'user_id') or not request.user_id:
-            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+    permission_classes = [HasUserId]
 
+    def get(self, request):
         from chirp.pagination import StandardResultsSetPagination
 
-        messages = Message._default_manager.filter(recipient_id=request.user_id).order_by("-created_at")
+        inbox = Message._default_manager.filter(recipient_id=request.user_id)
 
-        paginator = StandardResultsSetPagination()
-        paginated_messages = paginator.paginate_queryset(messages, request)
+        # Any new, edited, removed or re-attached message changes this fingerprint,
+        # so cached pages never need explicit invalidation
+        state = inbox.aggregate(
+            latest_id=Max("id"),
+            latest_update=Max("updated_at"),
+            total=Count("id"),
+            attachments=Sum("attachments_count"),
+        )
+        latest_update = state["latest_update"].timestamp() if state["latest_update"] else 0
+        # The body holds absolute next/previous links, so the origin is part of the key
+        cache_key = (
+            f"msglist:{request.user_id}:{state['latest_id']}:{latest_update}:"
+            f"{state['total']}:{state['attachments']}:"
+            f"{request.scheme}://{request.get_host()}:{request.GET.urlencode()}"
+        )
 
-        serializer = MessageSerializer(paginated_messages, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        body = cache.get(cache_key)
+        if body is None:
+            messages = inbox.order_by("-created_at").values(*MESSAGE_LIST_FIELDS)
 
-    def post(self, request):
-        if not hasattr(request, 'user_id') or not request.user_id:
-            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+            paginator = StandardResultsSetPagination()
+            # The fingerprint already counted the inbox, so the paginator skips its COUNT(*)
+            paginated_messages = paginator.paginate_queryset(messages, request, count=state["total"])
 
-        data = request.data.copy()
-        serializer = MessageSerializer(data=data)
+            body = paginator.get_paginated_response(fast_serialize_messages(paginated_messages)).data
+            cache.set(cache_key, body, MESSAGE_LIST_CACHE_TIMEOUT)
+
+        return Response(body)
+
+    def post(self, request):
+        # sender_id is injected at save time, so the request data is never copied or mutated
+        serializer = MessageSerializer(data=request.data)
         if serializer.is_valid():
             content_present = serializer.validated_data.get("content", "").strip()
             attachments_present = bool(request.FILES.getlist("attachments"))
@@ -43,34 +88,41 @@ class MessageListCreateView(APIView):
                 )
 
             content = serializer.validated_data.get("content", "")
-            message = serializer.save(sender_id=request.user_id, content=content)
-
             files = request.FILES.getlist("attachments")
-            for file in files:
-                content_type = file.content_type.lower()
-                if "image" in content_type:
-                    attachment_type = "image"
-                elif "video" in content_type:
-                    attachment_type = "video"
-                elif "audio" in content_type:
-                    attachment_type = "audio"
-                else:
-                    attachment_type = "file"
-
-                MessageAttachment._default_manager.create(
-                    message=message,
-                    file=file,
-                    attachment_type=attachment_type
+            # Files go to shared storage before the message exists, so a failed
+            # upload never leaves a message stuck in "processing"
+            staged_files = stage_uploads(files, ATTACHMENT_FILE_FIELD)
+            try:
+                message = serializer.save(
+                    sender_id=request.user_id,
+                    content=content,
+                    attachments_status="processing" if files else "none",
+                )
+            except Exception:
+                discard_staged_uploads(staged_files, ATTACHMENT_FILE_FIELD)
+                raise
+
+            # The Celery worker records the files once the message is committed,
+            # and the client polls attachments_status
+            if staged_files:
+                transaction.on_commit(
+                    partial(enqueue_persist_message_attachments, message.id, staged_files)
                 )
 
-            response_serializer = MessageSerializer(message)
-            return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+            # After save() the validating serializer renders the saved instance itself
+            message_data = serializer.data
+            if files:
+                return Response(message_data, status=status.HTTP_202_ACCEPTED)
+            return Response(message_data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class MessageDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a message
+
+    The queryset prefetches attachments; MessageSerializer.validate_content
+    reads that cache on update instead of running its own EXISTS query.
     """
     serializer_class = MessageSerializer
     queryset = Message._default_manager.all()
@@ -81,7 +133,7 @@ class MessageDetailView(generics.RetrieveUpdateDestroyAPIView):
             user_id = "default_user_123"
         return Message._default_manager.filter(
             Q(sender_id=user_id) | Q(recipient_id=user_id)
-        )
+        ).prefetch_related(attachments_prefetch())
 
     def perform_update(self, serializer):
         # Only allow sender to update the message
@@ -101,7 +153,7 @@ class MessageDetailView(generics.RetrieveUpdateDestroyAPIView):
             raise PermissionError("Only the sender can delete this message")
         # Soft delete by setting is_deleted flag
         instance.is_deleted = True
-        instance.save()
+        instance.save(update_fields=['is_deleted', 'updated_at'])
 
 
 class MessageReadView(APIView):
@@ -118,20 +170,47 @@ class MessageReadView(APIView):
             recipient_id=user_id,
             is_deleted=False
         )
-        message.is_read = True
-        message.save()
+        if not message.is_read:
+            message.is_read = True
+            # updated_at feeds the inbox cache fingerprint, so it is written too
+            message.save(update_fields=['is_read', 'updated_at'])
         serializer = MessageSerializer(message)
         return Response(serializer.data)
 
 
+class MessageBulkReadView(APIView):
+    """
+    Mark several received messages as read with a single UPDATE
+    """
+    permission_classes = [HasUserId]
+
+    def put(self, request):
+        message_ids = request.data.get('message_ids')
+        # type() rather than isinstance(), since bool is a subclass of int
+        if not isinstance(message_ids, list) or not all(type(i) is int for i in message_ids):
+            return Response({'error': 'message_ids must be a list of integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(message_ids) > MAX_BULK_READ_IDS:
+            return Response(
+                {'error': f'message_ids may hold at most {MAX_BULK_READ_IDS} ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        updated = Message._default_manager.filter(
+            pk__in=message_ids,
+            recipient_id=request.user_id,
+            is_deleted=False,
+            is_read=False,
+        ).update(is_read=True, updated_at=timezone.now())
+
+        return Response({'updated': updated})
+
+
 class MessageEditView(APIView):
     """Edit a specific message"""
+    permission_classes = [HasUserId]
 
     def put(self, request, message_id):
         """Edit message content"""
-        if not hasattr(request, 'user_id') or not request.user_id:
-            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
-
         try:
             message = Message._default_manager.get(id=message_id)
         except Message.DoesNotExist:
@@ -153,7 +232,7 @@ class MessageEditView(APIView):
         message.content = new_content
         message.is_edited = True
         message.edited_at = timezone.now()
-        message.save()
+        message.save(update_fields=['content', 'updated_at'])
 
         serializer = MessageSerializer(message, context={'request': request})
         return Response({
@@ -164,12 +243,10 @@ class MessageEditView(APIView):
 
 class MessageDeleteView(APIView):
     """Delete a specific message"""
+    permission_classes = [HasUserId]
 
     def delete(self, request, message_id):
         """Delete message"""
-        if not hasattr(request, 'user_id') or not request.user_id:
-            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
-
         try:
             message = Message._default_manager.get(id=message_id)
         except Message.DoesNotExist:
@@ -182,7 +259,7 @@ class MessageDeleteView(APIView):
 
         message.is_deleted = True
         message.deleted_at = timezone.now()
-        message.save()
+        message.save(update_fields=['is_deleted', 'updated_at'])
 
         return Response({
             'message': 'Message deleted successfully',
@@ -192,12 +269,10 @@ class MessageDeleteView(APIView):
 
 class ConversationMessageListView(APIView):
     """Get paginated messages for a conversation"""
+    permission_classes = [HasUserId]
 
     def get(self, request, conversation_id):
         """Get paginated messages for a conversation"""
-        if not hasattr(request, 'user_id') or not request.user_id:
-            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
-
         try:
             conversation = Conversation._default_manager.get(id=conversation_id)
         except Conversation.DoesNotExist:  # type: ignore
@@ -208,32 +283,21 @@ class ConversationMessageListView(APIView):
         if user_id not in conversation.participants:
             return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        page = int(request.GET.get('page', 1))
-        page_size = int(request.GET.get('page_size', 50))
-
         messages = Message._default_manager.filter(
             conversation=conversation,
             is_deleted=False
-        ).order_by('-created_at')
+        ).only(*MESSAGE_LIST_FIELDS).prefetch_related(attachments_prefetch())
 
-        paginator = Paginator(messages, page_size)
-
-        try:
-            page_obj = paginator.page(page)
-        except:
-            return Response({'error': 'Invalid page number'}, status=status.HTTP_400_BAD_REQUEST)
+        # Keyset pages seek on created_at instead of scanning past an OFFSET
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(messages, request, view=self)
 
-        serializer = MessageSerializer(page_obj.object_list, many=True, context={'request': request})
+        serializer = MessageSerializer(page, many=True, context={'request': request})
 
         return Response({
             'messages': serializer.data,
             'pagination': {
-                'current_page': page,
-                'total_pages': paginator.num_pages,
-                'total_messages': paginator.count,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous(),
-                'next_page': page_obj.next_page_number() if page_obj.has_next() else None,
-                'previous_page': page_obj.previous_page_number() if page_obj.has_previous() else None
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
             }
         })
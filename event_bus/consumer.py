@@ -6,6 +6,11 @@ import logging
 
 
 class BaseConsumer:
+    # Deliveries RabbitMQ may have in flight before they are acked; also the
+    # most messages handed to handle_batch at once
+    prefetch_count: int = 64
+    # Seconds a partial batch may wait for more messages before it is handled
+    batch_timeout: float = 0.2
 
     def __init__(self) -> None:
         self.queue_name = None
@@ -50,6 +55,14 @@ class BaseConsumer:
         """Override this in subclasses."""
         raise NotImplementedError
 
+    def handle_batch(self, messages: List[tuple]):
+        """
+        Handles a batch of (body, routing_key) pairs. Defaults to calling
+        handle_message for each; override to process the batch in bulk.
+        """
+        for body, routing_key in messages:
+            self.handle_message(body, routing_key)
+
     def start(self):
 
         if not self.queue_name:
@@ -66,6 +79,7 @@ class BaseConsumer:
             )
         )
         ch = conn.channel()
+        ch.basic_qos(prefetch_count=self.prefetch_count)
 
         # Declare exchange if specified
         if self.exchange_name:
@@ -86,13 +100,42 @@ class BaseConsumer:
                 routing_key=self.routing_key,
             )
 
+        buffer: List[tuple] = []
+        last_delivery_tag = None
+        flush_timer = None
+
+        def flush():
+            nonlocal flush_timer
+            if flush_timer is not None:
+                conn.remove_timeout(flush_timer)
+                flush_timer = None
+            if not buffer:
+                return
+            self.handle_batch(list(buffer))
+            # One ack covers every delivery up to and including the last tag.
+            # If handle_batch raises, nothing is acked and RabbitMQ redelivers
+            # the batch once the consumer reconnects.
+            ch.basic_ack(delivery_tag=last_delivery_tag, multiple=True)
+            buffer.clear()
+
+        def on_flush_timeout():
+            nonlocal flush_timer
+            flush_timer = None
+            flush()
+
         def callback(ch, method, properties, body):
-            self.handle_message(body.decode(), method.routing_key)
+            nonlocal last_delivery_tag, flush_timer
+            buffer.append((body.decode(), method.routing_key))
+            last_delivery_tag = method.delivery_tag
+            if len(buffer) >= self.prefetch_count:
+                flush()
+            elif flush_timer is None:
+                flush_timer = conn.call_later(self.batch_timeout, on_flush_timeout)
 
         ch.basic_consume(
             queue=self.queue_name,
             on_message_callback=callback,
-            auto_ack=True,
+            auto_ack=False,
         )
         self.logger.info(
             f"[{str(type(self).__name__)}] Listening for events on queue {self.queue_name}, bound to exchange {self.exchange_name}",
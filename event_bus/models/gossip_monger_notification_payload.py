@@ -1,4 +1,4 @@
-import json
+import orjson
 from typing import List, Dict, Optional
 import uuid
 
@@ -10,6 +10,11 @@ class GossipMongerNotificationPayLoad:
     APP_ID: str = "88ca0bb7-c0d7-4e36-b9e6-ea0e29213593"
     SOURCE_SERVICE_ID: str = "io.opencrafts.chirp"
     EVENT_TYPE: str = "push.send"
+    # The parts of "meta" that never change; to_bytes adds the request_id
+    _META: Dict[str, str] = {
+        "event_type": EVENT_TYPE,
+        "source_service_id": SOURCE_SERVICE_ID,
+    }
 
     def __init__(
         self,
@@ -42,9 +47,10 @@ class GossipMongerNotificationPayLoad:
         self.url = url
         self.buttons = buttons
 
-    def to_json(self) -> str:
+    def to_bytes(self) -> bytes:
         """
-        Converts the Notification object to a JSON string.
+        Converts the Notification object to compact UTF-8 JSON, ready to be
+        used as a message body.
         """
         # Construct the notification part of the JSON
         notification = {
@@ -63,10 +69,12 @@ class GossipMongerNotificationPayLoad:
             "buttons": self.buttons,
         }
 
-        meta = {
-            "event_type": self.EVENT_TYPE,
-            "source_service_id": self.SOURCE_SERVICE_ID,
-            "request_id": str(uuid.uuid4()),
-        }
+        meta = {**self._META, "request_id": str(uuid.uuid4())}
+
+        return orjson.dumps({"notification": notification, "meta": meta})
 
-        return json.dumps({"notification": notification, "meta": meta}, indent=4)
+    def to_json(self) -> str:
+        """
+        Converts the Notification object to a JSON string.
+        """
+        return self.to_bytes().decode()
@@ -1,17 +1,29 @@
+import os
+import queue
+from functools import partial
+
 import pika
+import pika.exceptions
 from django.conf import settings
+from django.db import transaction
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Idle (connection, channel) pairs ready for the next publish. Each pair is
+# checked out by one thread at a time, since BlockingConnection is not
+# thread-safe.
+_pool: queue.Queue = queue.Queue(maxsize=settings.RABBITMQ_POOL_SIZE)
+# Exchanges already confirmed to exist, so the passive declare runs once per process
+_declared_exchanges: set = set()
+# Celery workers are forked processes and a socket inherited across a fork
+# must never be used, so the pool is dropped whenever the pid changes
+_pool_pid = os.getpid()
+
 
 def _create_connection() -> pika.BlockingConnection:
     """
     Creates and returns a new RabbitMQ BlockingConnection.
-
-    A new connection is created on every call rather than reusing a singleton,
-    because Celery workers are forked processes and sharing a single connection
-    across forks corrupts the underlying TCP socket.
     """
     return pika.BlockingConnection(
         pika.ConnectionParameters(
@@ -29,30 +41,136 @@ def _create_connection() -> pika.BlockingConnection:
     )
 
 
-def publish(exchange: str, routing_key: str, message: str) -> None:
+def _acquire() -> tuple:
     """
-    Publishes a message to RabbitMQ and raises on failure so that
-    the Celery task caller can catch and retry.
+    Takes an open (connection, channel) pair from this process's pool, or
+    opens a new one when the pool is empty.
+    """
+    global _pool, _declared_exchanges, _pool_pid
 
-    Args:
-        exchange: The RabbitMQ exchange to publish to.
-        routing_key: The routing key for message delivery.
-        message: The serialized message body to publish.
+    pid = os.getpid()
+    if pid != _pool_pid:
+        # Abandon the parent's connections without closing them; closing would
+        # send frames on a socket the parent still owns
+        _pool = queue.Queue(maxsize=settings.RABBITMQ_POOL_SIZE)
+        _declared_exchanges = set()
+        _pool_pid = pid
 
-    Raises:
-        pika.exceptions.AMQPError: On any RabbitMQ connection or channel failure.
+    while True:
+        try:
+            conn, ch = _pool.get_nowait()
+        except queue.Empty:
+            conn = _create_connection()
+            return conn, conn.channel()
+        if conn.is_open and ch.is_open and _is_alive(conn):
+            return conn, ch
+        _discard(conn)
+
+
+def _is_alive(conn: pika.BlockingConnection) -> bool:
+    """
+    Services an idle connection's pending heartbeats and reports whether the
+    broker is still there. A pooled connection sits outside any I/O loop, so
+    the broker may have closed it for missed heartbeats while it was idle.
+    """
+    try:
+        conn.process_data_events(time_limit=0)
+    except Exception:
+        return False
+    return conn.is_open
+
+
+def _release(conn: pika.BlockingConnection, ch) -> None:
+    """
+    Returns a pair to the pool, closing it instead if the pool is full.
+    """
+    try:
+        _pool.put_nowait((conn, ch))
+    except queue.Full:
+        _discard(conn)
+
+
+def _discard(conn: pika.BlockingConnection) -> None:
+    """
+    Closes a connection that will not be reused, ignoring errors from one
+    that is already broken.
+    """
+    try:
+        if conn.is_open:
+            conn.close()
+    except Exception:
+        pass
+
+
+# Failures that mean the connection itself went away, as opposed to the broker
+# refusing the publish; these are worth one more try on a fresh connection
+_CONNECTION_LOST_ERRORS = (
+    pika.exceptions.AMQPConnectionError,
+    pika.exceptions.StreamLostError,
+    pika.exceptions.ConnectionWrongStateError,
+    pika.exceptions.ChannelWrongStateError,
+)
+
+
+def _publish_once(exchange: str, routing_key: str, message: str | bytes, fresh: bool) -> None:
+    """
+    Publishes on a pooled pair, or on a newly opened one when `fresh` is set,
+    and returns the pair to the pool only if the publish succeeded.
     """
     conn = None
     try:
-        conn = _create_connection()
-        ch = conn.channel()
-        ch.exchange_declare(exchange=exchange, passive=True)
+        if fresh:
+            conn = _create_connection()
+            ch = conn.channel()
+        else:
+            conn, ch = _acquire()
+        if exchange not in _declared_exchanges:
+            ch.exchange_declare(exchange=exchange, passive=True)
+            _declared_exchanges.add(exchange)
         ch.basic_publish(
             exchange=exchange,
             routing_key=routing_key,
             body=message,
             properties=pika.BasicProperties(delivery_mode=2),
         )
+    except Exception:
+        # The connection's state is unknown after a failure, so never pool it again
+        if conn is not None:
+            _discard(conn)
+        raise
+    _release(conn, ch)
+
+
+def publish(exchange: str, routing_key: str, message: str | bytes) -> None:
+    """
+    Publishes a message to RabbitMQ and raises on failure so that
+    the Celery task caller can catch and retry.
+
+    Connections are pooled per process, so a publish is normally a single
+    basic_publish on an already open channel. If that connection turns out
+    to have been lost, the publish is retried once on a fresh connection.
+
+    Args:
+        exchange: The RabbitMQ exchange to publish to.
+        routing_key: The routing key for message delivery.
+        message: The serialized message body to publish; bytes are sent as-is.
+
+    Raises:
+        pika.exceptions.AMQPError: On any RabbitMQ connection or channel failure.
+    """
+    try:
+        try:
+            _publish_once(exchange, routing_key, message, fresh=False)
+        except _CONNECTION_LOST_ERRORS as e:
+            logger.warning(
+                "Pooled RabbitMQ connection lost, retrying on a fresh connection",
+                extra={
+                    "exchange": exchange,
+                    "routing_key": routing_key,
+                    "error_type": type(e).__name__,
+                },
+            )
+            _publish_once(exchange, routing_key, message, fresh=True)
         logger.info(
             "Message published successfully",
             extra={
@@ -72,6 +190,25 @@ def publish(exchange: str, routing_key: str, message: str) -> None:
             },
         )
         raise
-    finally:
-        if conn is not None and conn.is_open:
-            conn.close()
+
+
+def publish_on_commit(
+    exchange: str, routing_key: str, message: str | bytes, using: str | None = None
+) -> None:
+    """
+    Publishes a message once the current database transaction commits, so a
+    rolled-back write never emits a notification. Outside a transaction the
+    message is published immediately.
+
+    Failures are logged rather than raised, because the database write has
+    already been committed by the time the publish runs.
+
+    Args:
+        exchange: The RabbitMQ exchange to publish to.
+        routing_key: The routing key for message delivery.
+        message: The serialized message body to publish.
+        using: The database alias whose transaction to wait for.
+    """
+    transaction.on_commit(
+        partial(publish, exchange, routing_key, message), using=using, robust=True
+    )
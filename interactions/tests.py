@@ -23,11 +23,16 @@ class InteractionTestCase(APITestCase):
 
         self.client.defaults["user_id"] = self.my_id
 
-    @patch("chirp.verisafe_authentication.verify_verisafe_jwt")
-    def test_block_user_success(self, mock_verify):
+        # Every test authenticates as self.me unless it overrides return_value
+        patcher = patch("chirp.verisafe_authentication.verify_verisafe_jwt")
+        self.mock_verify = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_verify.return_value = {"sub": self.my_id}
+
+    def test_block_user_success(self):
         """Tests that a user can block another user."""
 
-        mock_verify.return_value = {"sub": self.my_id, "name": "Tester"}
+        self.mock_verify.return_value = {"sub": self.my_id, "name": "Tester"}
 
         url = reverse("block-list-create")
         payload = {"blocked_user": self.other_id, "block_type": "user"}
@@ -39,12 +44,9 @@ class InteractionTestCase(APITestCase):
             Block.objects.filter(blocker=self.me, blocked_user=self.other_user).exists()
         )
 
-    @patch("chirp.verisafe_authentication.verify_verisafe_jwt")
-    def test_mutual_blocking_feed_exclusion(self, mock_verify):
+    def test_mutual_blocking_feed_exclusion(self):
         """Tests that mutual blocking works: I shouldn't see posts from someone who blocked me."""
 
-        mock_verify.return_value = {"sub": self.my_id}
-
         test_community = Community.objects.create(
             name="Test Community",
             description="A place for testing",
@@ -65,11 +67,8 @@ class InteractionTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertNotContains(response, "Hidden Content")
 
-    @patch("chirp.verisafe_authentication.verify_verisafe_jwt")
-    def test_unblock_user(self, mock_verify):
+    def test_unblock_user(self):
         """Tests unblocking a user."""
-        mock_verify.return_value = {"sub": self.my_id}
-
         block = Block.objects.create(
             blocker=self.me, blocked_user=self.other_user, block_type="user"
         )
@@ -80,11 +79,8 @@ class InteractionTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Block.objects.filter(id=block.id).exists())
 
-    @patch("chirp.verisafe_authentication.verify_verisafe_jwt")
-    def test_cannot_block_self(self, mock_verify):
+    def test_cannot_block_self(self):
         """Ensures a user cannot create a block record for themselves."""
-        mock_verify.return_value = {"sub": self.my_id}
-
         url = reverse("block-list-create")
         payload = {"blocked_user": self.my_id, "block_type": "user"}
 
@@ -93,11 +89,8 @@ class InteractionTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("error", response.data)
 
-    @patch("chirp.verisafe_authentication.verify_verisafe_jwt")
-    def test_duplicate_block_prevention(self, mock_verify):
+    def test_duplicate_block_prevention(self):
         """Ensures that a user cannot block the same user twice."""
-        mock_verify.return_value = {"sub": self.my_id}
-
         Block.objects.create(
             blocker=self.me, blocked_user=self.other_user, block_type="user"
         )
@@ -109,11 +102,8 @@ class InteractionTestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-    @patch("chirp.verisafe_authentication.verify_verisafe_jwt")
-    def test_blocked_community_feed_exclusion(self, mock_verify):
+    def test_blocked_community_feed_exclusion(self):
         """Tests that blocking a community hides its posts from the feed."""
-        mock_verify.return_value = {"sub": self.my_id}
-
         community_to_block = Community.objects.create(
             name="Spam City", description="Annoying posts here", creator=self.other_user
         )
@@ -132,11 +122,8 @@ class InteractionTestCase(APITestCase):
 
         self.assertNotContains(response, "Community Post")
 
-    @patch("chirp.verisafe_authentication.verify_verisafe_jwt")
-    def test_report_post_success(self, mock_verify):
+    def test_report_post_success(self):
         """Tests reporting a specific post."""
-        mock_verify.return_value = {"sub": self.my_id}
-
         test_community = Community.objects.create(
             name="Report Test", creator=self.other_user
         )
@@ -164,13 +151,12 @@ class InteractionTestCase(APITestCase):
             ).exists()
         )
 
-    @patch("chirp.verisafe_authentication.verify_verisafe_jwt")
-    def test_unblock_permission_denied(self, mock_verify):
+    def test_unblock_permission_denied(self):
         """Tests that a user cannot delete a block created by someone else."""
         attacker_id = "00000000-0000-0000-0000-000000000000"
         User.objects.create(user_id=attacker_id, username="attacker")
 
-        mock_verify.return_value = {"sub": attacker_id}
+        self.mock_verify.return_value = {"sub": attacker_id}
 
         block = Block.objects.create(
             blocker=self.me, blocked_user=self.other_user, block_type="user"
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.4 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0003_alter_attachment_file"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["-created_at"], name="post_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["community", "-created_at"], name="post_community_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("parent__isnull", True)),
+                fields=["post", "created_at"],
+                name="comment_post_root_idx",
+            ),
+        ),
+    ]
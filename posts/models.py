@@ -65,7 +65,7 @@ class Attachment(models.Model):
         return None
 
     def __str__(self):
-        return f"{self.attachment_type} attachment for post {self.post.id}"
+        return f"{self.attachment_type} attachment for post {self.post_id}"
 
 
 class Post(models.Model):
@@ -102,6 +102,13 @@ class Post(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Newest-first listings, overall and per community
+            models.Index(fields=["-created_at"], name="post_created_idx"),
+            models.Index(
+                fields=["community", "-created_at"], name="post_community_created_idx"
+            ),
+        ]
 
 
 class PostView(models.Model):
@@ -166,6 +173,14 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            # A post's top-level thread, in display order; replies are reached via parent
+            models.Index(
+                fields=["post", "created_at"],
+                name="comment_post_root_idx",
+                condition=models.Q(parent__isnull=True),
+            ),
+        ]
 
     def __str__(self):
         """
@@ -132,7 +132,8 @@ class PostSerializer(serializers.ModelSerializer):
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        # Write only the submitted columns; updated_at is auto_now and must be named
+        instance.save(update_fields=[*validated_data, "updated_at"])
 
         existing_ids = [a.get("id") for a in attachments_data if a.get("id")]
         instance.attachments.exclude(id__in=existing_ids).delete()
@@ -1,5 +1,6 @@
 from celery import shared_task
 from celery.app.trace import logging
+from pika.exceptions import AMQPError
 
 from communities.models import CommunityMembership
 from event_bus.models.gossip_monger_notification_payload import (
@@ -12,8 +13,16 @@ from posts.models import Post
 
 logger = logging.getLogger(__name__)
 
+# OneSignal accepts at most 2000 external user ids per notification
+MEMBER_BATCH_SIZE = 2000
 
-@shared_task(bind=True, max_retries=3)
+
+@shared_task(
+    bind=True,
+    autoretry_for=(AMQPError,),
+    retry_backoff=True,
+    max_retries=3,
+)
 def send_push_notification_to_post_creator(self, post_id: int) -> None:
     """
     Sends a push notification to the author of a newly created post,
@@ -51,18 +60,24 @@ def send_push_notification_to_post_creator(self, post_id: int) -> None:
         url=f"https://academia.opencrafts.io/post/{post_id}",
     )
 
-    publish(GOSSIP_MONGER_EXCHANGE, GOSSIP_MONGER_ROUTING_KEY, notification.to_json())
+    publish(GOSSIP_MONGER_EXCHANGE, GOSSIP_MONGER_ROUTING_KEY, notification.to_bytes())
 
 
-@shared_task(bind=True)
-def send_push_notification_to_community_members(self, post_id: int) -> None:
+@shared_task(bind=True, max_retries=3)
+def send_push_notification_to_community_members(
+    self, post_id: int, start_batch: int = 0
+) -> None:
     """
     Sends a push notification to all active, non-banned community members
     (excluding the post author) when a new post is created.
     Batches in groups of 2000 to respect OneSignal's limit.
 
+    A failed publish retries the task from the failed batch, so members in
+    batches already sent are not notified twice.
+
     Args:
         post_id: The primary key of the newly created Post.
+        start_batch: Index of the first batch still to be sent.
     """
     try:
         post = Post.objects.select_related("author", "community").get(id=post_id)
@@ -78,18 +93,20 @@ def send_push_notification_to_community_members(self, post_id: int) -> None:
             banned=False,
         )
         .exclude(user=post.author)
+        # A stable order keeps batch boundaries the same across retries
+        .order_by("user__user_id")
         .values_list("user__user_id", flat=True)
     )
 
-    # Batch into chunks of 2000
+    # Batch into chunks of MEMBER_BATCH_SIZE
     member_ids_list = [str(uid) for uid in member_ids]
-    batch_size = 2000
     batches = [
-        member_ids_list[i : i + batch_size]
-        for i in range(0, len(member_ids_list), batch_size)
+        member_ids_list[i : i + MEMBER_BATCH_SIZE]
+        for i in range(0, len(member_ids_list), MEMBER_BATCH_SIZE)
     ]
 
-    for batch in batches:
+    for index in range(start_batch, len(batches)):
+        batch = batches[index]
         notification = GossipMongerNotificationPayLoad(
             headings={"en": f"New in a/{post.community.name}"},
             contents={"en": f"@{post.author.username}: {post.title}"},
@@ -113,6 +130,18 @@ def send_push_notification_to_community_members(self, post_id: int) -> None:
             small_icon=None,
             url=f"https://academia.opencrafts.io/post/{post_id}",
         )
-        publish(
-            GOSSIP_MONGER_EXCHANGE, GOSSIP_MONGER_ROUTING_KEY, notification.to_json()
-        )
+        try:
+            publish(
+                GOSSIP_MONGER_EXCHANGE,
+                GOSSIP_MONGER_ROUTING_KEY,
+                notification.to_bytes(),
+            )
+        except AMQPError as exc:
+            # Replace args and kwargs outright; retry() would otherwise reuse the
+            # original positional post_id alongside the new kwargs
+            raise self.retry(
+                exc=exc,
+                args=(post_id, index),
+                kwargs={},
+                countdown=2**self.request.retries,
+            )
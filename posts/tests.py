@@ -5,9 +5,14 @@ from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
 
+from celery.exceptions import Retry
+from pika.exceptions import AMQPError
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from communities.models import CommunityMembership
+from .tasks import send_push_notification_to_community_members
+
 
 from .models import Post, Community, PostVotes, User
 
@@ -337,3 +342,45 @@ class PostVotesTest(APITestCase):
         self.assertEqual(response.data["value"], -1)
         self.post.refresh_from_db()
         self.assertEqual(self.post.upvotes, 0, "Post votes should be equal to zero.")
+
+
+class CommunityMemberNotificationRetryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create(
+            name="Test User", username="testwriter", email="test@example.com"
+        )
+        cls.community = Community.objects.create(
+            name="General", visibility="public", private=False, creator=cls.author
+        )
+        cls.members = [
+            User.objects.create(name=f"Member {i}", username=f"member{i}")
+            for i in range(3)
+        ]
+        for member in cls.members:
+            CommunityMembership.objects.create(
+                community=cls.community, user=member, role="member"
+            )
+        cls.post = Post.objects.create(
+            title="Old Legend", author=cls.author, community=cls.community
+        )
+
+    @patch("posts.tasks.MEMBER_BATCH_SIZE", 1)
+    @patch("posts.tasks.publish")
+    def test_failed_batch_retries_from_that_batch(self, mock_publish):
+        """A publish failure retries with (post_id, batch index) and no duplicate kwargs."""
+        task = send_push_notification_to_community_members
+        mock_publish.side_effect = [None, AMQPError("broker gone")]
+
+        with patch.object(task, "retry", side_effect=Retry()) as mock_retry:
+            with self.assertRaises(Retry):
+                task(self.post.id)
+
+        retry_kwargs = mock_retry.call_args.kwargs
+        self.assertEqual(retry_kwargs["args"], (self.post.id, 1))
+        self.assertEqual(retry_kwargs["kwargs"], {})
+
+        # Running the retry's arguments resumes at the failed batch only
+        mock_publish.reset_mock(side_effect=True)
+        task(*retry_kwargs["args"], **retry_kwargs["kwargs"])
+        self.assertEqual(mock_publish.call_count, 2)
@@ -18,3 +18,54 @@ def get_post_attachment_path(instance, filename):
     ext = filename.split(".")[-1]
     filename = f"{uuid.uuid4().hex}.{ext}"
     return os.path.join("attachments", str(instance.attachment_type), "posts", filename)
+
+
+def stage_upload(uploaded_file, field):
+    """
+    Store an uploaded file through `field`'s storage, under the name the field
+    would give it, so a Celery worker can record it after the request has
+    returned.
+
+    The storage is shared by the web and worker processes, unlike the local
+    disk, so the worker can always reach what the request staged.
+
+    Args:
+        uploaded_file: The UploadedFile from request.FILES.
+        field: The FileField the file will be attached to.
+
+    Returns:
+        dict: JSON-serialisable description of the staged file.
+    """
+    stored_name = field.storage.save(
+        field.generate_filename(None, uploaded_file.name), uploaded_file
+    )
+    return {
+        "stored_name": stored_name,
+        "name": uploaded_file.name,
+        "content_type": uploaded_file.content_type or "",
+        "size": uploaded_file.size,
+    }
+
+
+def stage_uploads(uploaded_files, field):
+    """
+    Stage every file with stage_upload, or none of them: if one fails, the
+    files already staged are deleted before the error is re-raised.
+    """
+    staged_files = []
+    try:
+        for uploaded_file in uploaded_files:
+            staged_files.append(stage_upload(uploaded_file, field))
+    except Exception:
+        discard_staged_uploads(staged_files, field)
+        raise
+    return staged_files
+
+
+def discard_staged_uploads(staged_files, field):
+    """
+    Delete staged files that will never be recorded, e.g. because their
+    message was deleted before the worker ran.
+    """
+    for staged in staged_files:
+        field.storage.delete(staged["stored_name"])
@@ -4,6 +4,7 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.core.cache import cache
 from django.conf import settings
+from conversations.cache import invalidate_conversation_lists
 from conversations.models import Conversation, ConversationMessage
 from dmessages.models import MessageAttachment
 import bleach
@@ -240,6 +241,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                     file_upload_id=file_upload_id
                 )
 
+            invalidate_conversation_lists(conversation.participants)
             return message
         except Exception:
             return None
@@ -394,6 +396,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
             message.edited_at = timezone.now()
             message.save()
 
+            # The edit may be the conversation's last-message preview
+            invalidate_conversation_lists(message.conversation.participants)
             return message
         except ConversationMessage.DoesNotExist:
             return None
@@ -414,6 +418,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             message.deleted_at = timezone.now()
             message.save()
 
+            invalidate_conversation_lists(message.conversation.participants)
             return True
         except ConversationMessage.DoesNotExist:
             return False
@@ -1,5 +1,6 @@
 from django.core.paginator import Paginator
 from django.db.models import Q
+from conversations.cache import invalidate_conversation_lists
 from conversations.models import Conversation, ConversationMessage
 from dmessages.models import MessageAttachment
 from typing import Dict, List
@@ -96,6 +97,9 @@ class ChatService:
                 )
 
             updated_count = messages.update(is_read=True)
+            if updated_count:
+                # unread_count in every participant's conversation list just changed
+                invalidate_conversation_lists(conversation.participants)
 
             return {
                 'success': True,